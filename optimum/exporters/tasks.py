@@ -24,7 +24,7 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tupl
 
 import huggingface_hub
 from transformers import AutoConfig, PretrainedConfig, is_tf_available, is_torch_available
-from transformers.utils import TF2_WEIGHTS_NAME, WEIGHTS_NAME, logging
+from transformers.utils import TF2_WEIGHTS_NAME, WEIGHTS_NAME, is_offline_mode, logging
 
 from ..utils.import_utils import is_onnx_available
 
@@ -1118,7 +1118,7 @@ class TasksManager:
         The priority is in the following order:
             1. User input via `framework`.
             2. If local checkpoint is provided, use the same framework as the checkpoint.
-            3. If model repo, try to infer the framework from the Hub.
+            3. If model repo, try to infer the framework from the Hub, unless offline mode is enabled.
             4. If could not infer, use available framework in environment, with priority given to PyTorch.
 
         Args:
@@ -1145,6 +1145,9 @@ class TasksManager:
                 for dirpath, _, filenames in os.walk(full_model_path)
                 for file in filenames
             ]
+        elif is_offline_mode():
+            # The repository files can not be listed without network access, fall back to the available framework
+            all_files = None
         else:
             if not isinstance(model_name_or_path, str):
                 model_name_or_path = str(model_name_or_path)
@@ -1152,27 +1155,34 @@ class TasksManager:
             if subfolder != "":
                 all_files = [file[len(subfolder) + 1 :] for file in all_files if file.startswith(subfolder)]
 
-        weight_name = Path(WEIGHTS_NAME).stem
-        weight_extension = Path(WEIGHTS_NAME).suffix
-        is_pt_weight_file = [file.startswith(weight_name) and file.endswith(weight_extension) for file in all_files]
-
-        weight_name = Path(TF2_WEIGHTS_NAME).stem
-        weight_extension = Path(TF2_WEIGHTS_NAME).suffix
-        is_tf_weight_file = [file.startswith(weight_name) and file.endswith(weight_extension) for file in all_files]
-
-        if any(is_pt_weight_file):
-            framework = "pt"
-        elif any(is_tf_weight_file):
-            framework = "tf"
-        elif "model_index.json" in all_files and any(file.endswith(Path(WEIGHTS_NAME).suffix) for file in all_files):
-            # stable diffusion case
-            framework = "pt"
-        else:
-            raise FileNotFoundError(
-                "Cannot determine framework from given checkpoint location."
-                f" There should be a {Path(WEIGHTS_NAME).stem}*{Path(WEIGHTS_NAME).suffix} for PyTorch"
-                f" or {Path(TF2_WEIGHTS_NAME).stem}*{Path(TF2_WEIGHTS_NAME).suffix} for TensorFlow."
-            )
+        if all_files is not None:
+            weight_name = Path(WEIGHTS_NAME).stem
+            weight_extension = Path(WEIGHTS_NAME).suffix
+            is_pt_weight_file = [
+                file.startswith(weight_name) and file.endswith(weight_extension) for file in all_files
+            ]
+
+            weight_name = Path(TF2_WEIGHTS_NAME).stem
+            weight_extension = Path(TF2_WEIGHTS_NAME).suffix
+            is_tf_weight_file = [
+                file.startswith(weight_name) and file.endswith(weight_extension) for file in all_files
+            ]
+
+            if any(is_pt_weight_file):
+                framework = "pt"
+            elif any(is_tf_weight_file):
+                framework = "tf"
+            elif "model_index.json" in all_files and any(
+                file.endswith(Path(WEIGHTS_NAME).suffix) for file in all_files
+            ):
+                # stable diffusion case
+                framework = "pt"
+            else:
+                raise FileNotFoundError(
+                    "Cannot determine framework from given checkpoint location."
+                    f" There should be a {Path(WEIGHTS_NAME).stem}*{Path(WEIGHTS_NAME).suffix} for PyTorch"
+                    f" or {Path(TF2_WEIGHTS_NAME).stem}*{Path(TF2_WEIGHTS_NAME).suffix} for TensorFlow."
+                )
 
         if is_torch_available():
             framework = framework or "pt"
@@ -23,6 +23,7 @@ from typing import TYPE_CHECKING, Optional, Union
 
 from huggingface_hub import HfApi, HfFolder
 from transformers import AutoConfig, add_start_docstrings
+from transformers.utils import is_offline_mode
 
 from .utils import CONFIG_NAME
 
@@ -220,6 +221,7 @@ class OptimizedModel(ABC):
         force_download: bool = False,
         subfolder: str = "",
         trust_remote_code: bool = False,
+        local_files_only: bool = False,
     ) -> "PretrainedConfig":
         try:
             config = AutoConfig.from_pretrained(
@@ -230,6 +232,7 @@ class OptimizedModel(ABC):
                 use_auth_token=use_auth_token,
                 subfolder=subfolder,
                 trust_remote_code=trust_remote_code,
+                local_files_only=local_files_only,
             )
         except OSError as e:
             # if config not found in subfolder, search for it at the top level
@@ -241,6 +244,7 @@ class OptimizedModel(ABC):
                     force_download=force_download,
                     use_auth_token=use_auth_token,
                     trust_remote_code=trust_remote_code,
+                    local_files_only=local_files_only,
                 )
                 logger.info(
                     f"config.json not found in the specified subfolder {subfolder}. Using the top level config.json."
@@ -321,6 +325,10 @@ class OptimizedModel(ABC):
                 )
             model_id, revision = model_id.split("@")
 
+        if is_offline_mode() and not local_files_only:
+            logger.info("Offline mode: forcing local_files_only=True")
+            local_files_only = True
+
         if config is None:
             if os.path.isdir(os.path.join(model_id, subfolder)) and cls.config_name == CONFIG_NAME:
                 if CONFIG_NAME in os.listdir(os.path.join(model_id, subfolder)):
@@ -340,6 +348,7 @@ class OptimizedModel(ABC):
                     use_auth_token=use_auth_token,
                     force_download=force_download,
                     subfolder=subfolder,
+                    local_files_only=local_files_only,
                 )
         elif isinstance(config, (str, os.PathLike)):
             config = cls._load_config(
@@ -349,6 +358,7 @@ class OptimizedModel(ABC):
                 use_auth_token=use_auth_token,
                 force_download=force_download,
                 subfolder=subfolder,
+                local_files_only=local_files_only,
             )
 
         if not export and trust_remote_code:
@@ -55,6 +55,7 @@ class ORTModelPart:
         self.output_names = {output_key.name: idx for idx, output_key in enumerate(self.session.get_outputs())}
 
         self._ordered_input_names = get_ordered_input_names(self.input_names.keys(), func=self.forward)
+        self._logits_idx = self.output_names.get("logits")
 
     @property
     def device(self):
@@ -152,7 +153,7 @@ class ORTDecoder(ORTModelPart):
 
         self.use_fp16 = False
         for inp in session.get_inputs():
-            if inp.name == "past_key_values" and inp.type == "tensor(float16)":
+            if inp.name in self.key_value_input_names and inp.type == "tensor(float16)":
                 self.use_fp16 = True
                 break
 
@@ -306,6 +307,18 @@ class ORTDecoder(ORTModelPart):
                 past_key_value for pkv_per_layer in past_key_values for past_key_value in pkv_per_layer
             )
 
+        if attention_mask is None and "attention_mask" in self.input_names:
+            # The exported decoders require the attention mask, which defaults to attending all the positions as in
+            # Transformers (e.g. for an unpadded prompt)
+            sequence_length = input_ids.shape[1]
+            if past_key_values is not None:
+                sequence_length += past_key_values[0].shape[self.key_sequence_length_idx]
+            attention_mask_shape = (input_ids.shape[0], sequence_length)
+            if use_torch:
+                attention_mask = torch.ones(attention_mask_shape, dtype=torch.int64, device=input_ids.device)
+            else:
+                attention_mask = np.ones(attention_mask_shape, dtype=np.int64)
+
         # no-ops if merged decoder is not used
         use_cache_branch_tensor, past_key_values = self.prepare_inputs_for_merged(
             input_ids, past_key_values, use_torch=use_torch
@@ -359,57 +372,42 @@ class ORTDecoder(ORTModelPart):
             if "loss" in self.output_names:
                 loss = output_buffers["loss"].view(output_shapes["loss"])
         else:
-            if use_torch:
-                onnx_inputs = {
-                    "input_ids": input_ids.cpu().detach().numpy(),
-                    "attention_mask": attention_mask.cpu().detach().numpy(),
-                }
+            onnx_inputs = {
+                "input_ids": input_ids,
+                "attention_mask": attention_mask,
+            }
 
-                if self.parent_model.use_merged is True:
-                    onnx_inputs["use_cache_branch"] = use_cache_branch_tensor.cpu().detach().numpy()
+            if self.parent_model.use_merged is True:
+                onnx_inputs["use_cache_branch"] = use_cache_branch_tensor
 
-                if past_key_values is not None:
-                    # Add the past_key_values to the decoder inputs
-                    for input_name, past_key_value in zip(self.key_value_input_names, past_key_values):
-                        onnx_inputs[input_name] = past_key_value.cpu().detach().numpy()
-
-                if "labels" in self.input_names:
-                    onnx_inputs["labels"] = labels.cpu().detach().numpy()
-            else:
-                onnx_inputs = {
-                    "input_ids": input_ids,
-                    "attention_mask": attention_mask,
-                }
-
-                if self.parent_model.use_merged is True:
-                    onnx_inputs["use_cache_branch"] = use_cache_branch_tensor
+            if past_key_values is not None:
+                # Add the past_key_values to the decoder inputs
+                for input_name, past_key_value in zip(self.key_value_input_names, past_key_values):
+                    onnx_inputs[input_name] = past_key_value
 
-                if past_key_values is not None:
-                    # Add the past_key_values to the decoder inputs
-                    for input_name, past_key_value in zip(self.key_value_input_names, past_key_values):
-                        onnx_inputs[input_name] = past_key_value
+            if "labels" in self.input_names:
+                onnx_inputs["labels"] = labels
 
-                if "labels" in self.input_names:
-                    onnx_inputs["labels"] = labels
+            if use_torch:
+                onnx_inputs = dict(zip(onnx_inputs.keys(), self.parent_model._tensors_to_numpy(*onnx_inputs.values())))
 
-            # Run inference
-            outputs = self.session.run(None, onnx_inputs)
+            # Run inference, the outputs are returned as PyTorch tensors also for NumPy inputs
+            outputs = self.parent_model._run_inference(onnx_inputs, use_torch=True, model=self.session)
 
             # Tuple of length equal to : number of layer * number of past_key_value per decoder layer (2 for the self-attention)
             past_key_values = tuple(
-                torch.from_numpy(outputs[self.output_names[key]]).to(self.device)
-                for key in self.key_value_output_names
+                outputs[self.output_names[key]].to(self.device) for key in self.key_value_output_names
             )
 
             # Tuple of tuple of length `n_layers`, with each tuple of length equal to the number of self-attention and
             # per decoder layer
             num_pkv = 2
             past_key_values = tuple(past_key_values[i : i + num_pkv] for i in range(0, len(past_key_values), num_pkv))
-            logits = torch.from_numpy(outputs[self.output_names["logits"]]).to(self.device)
+            logits = outputs[self._logits_idx].to(self.device)
 
             loss = None
             if "loss" in self.output_names:
-                loss = torch.from_numpy(outputs[self.output_names["loss"]]).to(self.device)
+                loss = outputs[self.output_names["loss"]].to(self.device)
 
         return CausalLMOutputWithCrossAttentions(loss=loss, logits=logits, past_key_values=past_key_values)
 
@@ -667,7 +665,7 @@ class ORTDecoderForSeq2Seq(ORTDecoder):
                 for key in self.key_value_output_names
             )
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             if use_torch:
                 logits = torch.from_numpy(logits).to(self.device)
 
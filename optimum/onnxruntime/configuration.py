@@ -635,6 +635,12 @@ class OptimizationConfig:
             The optimized graph might contain operators for GPU or CPU only when `optimization_level` > 1.
         fp16 (`bool`, defaults to `False`):
             Whether all weights and nodes should be converted from float32 to float16.
+        fp16_keep_io_types (`Union[bool, List[str]]`, defaults to `True`):
+            Whether to keep the model inputs and outputs as float32 when `fp16=True`. A list of input and output names
+            to keep as float32 can also be passed.
+        fp16_op_block_list (`Optional[List[str]]`, defaults to `None`):
+            The operator types to keep as float32 when `fp16=True`, for instance the ones lacking float16 kernels for
+            the targeted execution provider. If `None`, ONNX Runtime default block list is used.
         enable_transformers_specific_optimizations (`bool`, defaults to `True`):
             Whether to only use `transformers` specific optimizations on top of ONNX Runtime general optimizations.
         disable_gelu_fusion (`bool`, defaults to `False`):
@@ -656,7 +662,9 @@ class OptimizationConfig:
             Whether to enable Gelu / BiasGelu to FastGelu conversion.
             The default value is set to `False` since this approximation might slightly impact the model's accuracy.
         use_mask_index (`bool`, defaults to `False`):
-            Whether to use mask index instead of raw attention mask in the attention operator.
+            Whether to use mask index instead of raw attention mask in the attention operator. The 2D `attention_mask`
+            input of the model is left unchanged and reduced to the 1D lengths of the sequences inside the graph, which
+            lets ONNX Runtime dispatch to its fused attention kernels. It requires right-side padding.
         no_attention_mask (`bool`, defaults to `False`):
             Whether to not use attention masks. Only works for bert model type.
         disable_embed_layer_norm (`bool`, defaults to `True`):
@@ -683,6 +691,8 @@ class OptimizationConfig:
     optimize_for_gpu: bool = False
 
     fp16: bool = False
+    fp16_keep_io_types: Union[bool, List[str]] = True
+    fp16_op_block_list: Optional[List[str]] = None
 
     optimize_with_onnxruntime_only: Optional[bool] = None
     enable_transformers_specific_optimizations: bool = True
@@ -717,7 +727,7 @@ class OptimizationConfig:
     # ONNX Runtime 1.14.0 arguments
     use_multi_head_attention = False
     enable_gemm_fast_gelu_fusion = False
-    use_raw_attention_mask = False
+    use_raw_attention_mask: bool = False
     disable_group_norm_fusion = True
     disable_packed_kv = True
 
@@ -751,6 +761,12 @@ class OptimizationConfig:
         deprecate_renamed_attribute("disable_bias_gelu", "disable_bias_gelu_fusion")
         deprecate_renamed_attribute("disable_embed_layer_norm", "disable_embed_layer_norm_fusion")
 
+        if self.use_mask_index and self.use_raw_attention_mask:
+            logger.warning(
+                "Both use_mask_index and use_raw_attention_mask are set, the raw attention mask will be used and the "
+                "fused attention kernels relying on the mask index may not be dispatched."
+            )
+
     def create_fusion_options(self, model_type: str) -> FusionOptions:
         class Box:
             pass
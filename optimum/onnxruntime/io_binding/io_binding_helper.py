@@ -99,6 +99,9 @@ class IOBindingHelper:
 
         if is_onnxruntime_training_available():
             return IOBindingHelper.to_pytorch_via_dlpack(ort_value)
+        elif ort_value.device_name().lower() == "cpu":
+            # Outputs bound on CPU (CPUExecutionProvider) are already in host memory
+            return IOBindingHelper.to_pytorch_via_numpy(ort_value)
         else:
             try:
                 return IOBindingHelper.to_pytorch_via_cupy(ort_value)
@@ -167,16 +170,21 @@ class IOBindingHelper:
 
         # Bind inputs and outputs to onnxruntime session
         io_binding = ort_model.model.io_binding()
+        # ONNX Runtime expects an integer device id, also for CPU
+        device_index = IOBindingHelper.get_device_index(ort_model.device)
 
-        # Bind inputs
+        # Bind inputs. Only the data pointers are bound, so the contiguous copies of the inputs need to be kept alive as
+        # long as the IOBinding
+        bound_tensors = []
         for input_name in ort_model.inputs_names:
             onnx_input = inputs.pop(input_name)
             onnx_input = onnx_input.contiguous()
+            bound_tensors.append(onnx_input)
 
             io_binding.bind_input(
                 input_name,
                 onnx_input.device.type,
-                ort_model.device.index,
+                device_index,
                 name_to_np_type[input_name],
                 list(onnx_input.size()),
                 onnx_input.data_ptr(),
@@ -184,6 +192,7 @@ class IOBindingHelper:
 
         # Bind outputs
         for name in ort_model.output_names:
-            io_binding.bind_output(name, ort_model.device.type, device_id=ort_model.device.index)
+            io_binding.bind_output(name, ort_model.device.type, device_id=device_index)
 
+        io_binding._bound_tensors = bound_tensors
         return io_binding
@@ -15,7 +15,6 @@
 import importlib
 import logging
 import os
-import shutil
 from abc import abstractmethod
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -39,6 +38,7 @@ from ..utils import (
     DIFFUSION_MODEL_UNET_SUBFOLDER,
     DIFFUSION_MODEL_VAE_DECODER_SUBFOLDER,
 )
+from ..utils.file_utils import copy_file
 from .modeling_ort import ORTModel
 from .utils import (
     _ORT_TO_NP_TYPE,
@@ -180,7 +180,7 @@ class ORTStableDiffusionPipeline(ORTModel, StableDiffusionPipelineMixin):
 
         for src_path, dst_path in zip(src_paths, dst_paths):
             dst_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copyfile(src_path, dst_path)
+            copy_file(src_path, dst_path)
 
         self.tokenizer.save_pretrained(save_directory.joinpath("tokenizer"))
         self.scheduler.save_pretrained(save_directory.joinpath("scheduler"))
@@ -285,7 +285,7 @@ class ORTStableDiffusionPipeline(ORTModel, StableDiffusionPipelineMixin):
         config: Optional[str] = None,
         use_auth_token: Optional[Union[bool, str]] = None,
         revision: str = "main",
-        force_download: bool = True,
+        force_download: bool = False,
         cache_dir: Optional[str] = None,
         subfolder: str = "",
         local_files_only: bool = False,
@@ -13,12 +13,16 @@
 #  limitations under the License.
 """ORTModelForXXX classes, allowing to run ONNX Models with ONNX Runtime using the same API as Transformers."""
 
+import json
 import logging
+import os
 import re
-import shutil
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 import numpy as np
 import torch
@@ -60,13 +64,14 @@ from ..exporters import TasksManager
 from ..exporters.onnx import main_export
 from ..modeling_base import FROM_PRETRAINED_START_DOCSTRING, OptimizedModel
 from ..onnx.utils import _get_external_data_paths
-from ..utils.file_utils import find_files_matching_pattern
+from ..utils.file_utils import copy_file, find_files_matching_pattern
 from ..utils.save_utils import maybe_load_preprocessors, maybe_save_preprocessors
 from .io_binding import IOBindingHelper, TypeHelper
 from .utils import (
     ONNX_WEIGHTS_NAME,
     check_io_binding,
     get_device_for_provider,
+    get_optimized_model_cache_path,
     get_ordered_input_names,
     get_provider_for_device,
     parse_device,
@@ -80,6 +85,32 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Process-wide registry of the inference sessions loaded with `use_session_cache=True`, a session is dropped from it as
+# soon as no model holds it anymore.
+_INFERENCE_SESSIONS_CACHE: "weakref.WeakValueDictionary[Tuple, ort.InferenceSession]" = weakref.WeakValueDictionary()
+
+
+class SessionIOMetadata(NamedTuple):
+    """
+    Inputs and outputs metadata of an inference session.
+    """
+
+    inputs: Tuple[ort.NodeArg, ...]
+    outputs: Tuple[ort.NodeArg, ...]
+    name_to_np_type: Dict[str, np.dtype]
+    name_to_ort_type: Dict[str, str]
+    output_names: List[str]
+
+
+# Inputs / outputs metadata of the inference sessions, resolved once per session as `InferenceSession.get_inputs()` and
+# `InferenceSession.get_outputs()` wrap new NodeArg objects on every call.
+_SESSIONS_IO_METADATA: "weakref.WeakKeyDictionary[ort.InferenceSession, SessionIOMetadata]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# OrtValues can be exported through DLPack with onnxruntime-training builds only
+_ORT_VALUE_SUPPORTS_DLPACK = hasattr(ort.OrtValue, "to_dlpack")
+
 
 _TOKENIZER_FOR_DOC = "AutoTokenizer"
 _FEATURE_EXTRACTOR_FOR_DOC = "AutoFeatureExtractor"
@@ -94,7 +125,7 @@ ONNX_MODEL_START_DOCSTRING = r"""
             Initializing with a config file does not load the weights associated with the model, only the
             configuration. Check out the [`~onnxruntime.modeling_ort.ORTModel.from_pretrained`] method to load the model weights.
         model (`onnxruntime.InferenceSession`): [onnxruntime.InferenceSession](https://onnxruntime.ai/docs/api/python/api_summary.html#inferencesession) is the main class used to run a model. Check out the [`~onnxruntime.modeling_ort.ORTModel.load_model`] method for more information.
-        use_io_binding (`Optional[bool]`, defaults to `None`): Whether to use IOBinding during inference to avoid memory copy between the host and devices. Defaults to `True` if the device is CUDA, otherwise defaults to `False`.
+        use_io_binding (`Optional[bool]`, defaults to `None`): Whether to use IOBinding during inference to avoid memory copy between the host and devices. Defaults to `True` if the device is CUDA, otherwise defaults to `False`. On CPU, enabling it lets ONNX Runtime read the inputs from and write the outputs to torch tensors directly.
 """
 
 ONNX_TEXT_INPUTS_DOCSTRING = r"""
@@ -158,6 +189,15 @@ class ORTModel(OptimizedModel):
         - config ([`~transformers.PretrainedConfig`] -- The configuration of the model.
         - use_io_binding (`bool`, *optional*, defaults to `True`) -- Whether to use I/O bindings with **ONNX Runtime
         with the CUDAExecutionProvider**, this can significantly speedup inference depending on the task.
+        - reuse_output_buffers (`bool`, defaults to `False`) -- Whether to have ONNX Runtime write the outputs in the same
+        buffers from one call to the next when using I/O bindings, which avoids allocating them on each call. If
+        enabled, the outputs of a call are overwritten by the next call, and need to be cloned to be kept.
+        - io_binding_cache_size (`int`, defaults to `0`) -- The number of input shapes for which the I/O bindings,
+        along with their input and output buffers, are kept to be reused by the next calls with the same shapes. This
+        avoids binding and allocating on each call for static shapes workloads (e.g. inputs padded to a fixed length).
+        As with `reuse_output_buffers`, the outputs of a call are overwritten by the next call with the same shapes.
+        When the `enable_cuda_graph` option of `CUDAExecutionProvider` is set, it defaults to `1` and the input shapes
+        can not change after the first call, as the CUDA graph captured on the first run is replayed on the same buffers.
         - model_save_dir (`Path`) -- The directory where the model exported to ONNX is saved.
         By defaults, if the loaded model is local, the directory where the original model will be used. Otherwise, the
         cache directory is used.
@@ -207,7 +247,9 @@ class ORTModel(OptimizedModel):
             )
 
         self.providers = model.get_providers()
-        self._device = get_device_for_provider(self.providers[0])
+        self._device = get_device_for_provider(
+            self.providers[0], provider_options=model.get_provider_options().get(self.providers[0])
+        )
 
         # This attribute is needed to keep one reference on the temporary directory, since garbage collecting it
         # would end-up removing the directory containing the underlying ONNX model.
@@ -273,6 +315,25 @@ class ORTModel(OptimizedModel):
         self.output_names = {output_key.name: idx for idx, output_key in enumerate(model.get_outputs())}
 
         self._ordered_input_names = get_ordered_input_names(self.inputs_names.keys(), func=self.forward)
+        # Tokenizers may return token_type_ids although the exported model does not take them as input (e.g. when
+        # `return_token_type_ids` is not set), resolve it once here rather than on every forward call
+        self._has_token_type_ids = "token_type_ids" in self.inputs_names
+        # Index of the logits output, resolved once as it is looked up on every forward call
+        self._logits_idx = self.output_names.get("logits")
+
+        self.reuse_output_buffers = False
+        self._output_buffers = {}
+        self.io_binding_cache_size = 0
+        self._io_bindings_cache = OrderedDict()
+
+        self._use_cuda_graph = self._is_cuda_graph_enabled(model)
+        if self._use_cuda_graph:
+            if not self.use_io_binding:
+                raise ValueError(
+                    "The enable_cuda_graph option of CUDAExecutionProvider requires the inputs and outputs to always be "
+                    "bound to the same buffers, please pass use_io_binding=True."
+                )
+            self.io_binding_cache_size = 1
 
     # TODO: why do we make device a property since we are only access the value, and do not do any check when setting the value?
     @property
@@ -320,11 +381,17 @@ class ORTModel(OptimizedModel):
             )
 
         self.device = device
+        self._io_bindings_cache.clear()
         provider = get_provider_for_device(self.device)
         validate_provider_availability(provider)  # raise error if the provider is not available
 
-        self.model.set_providers([provider], provider_options=[provider_options])
+        if any(session is self.model for session in _INFERENCE_SESSIONS_CACHE.values()):
+            # The session may be shared with other models, which should not be moved along
+            self.model = ORTModel.load_model(self.model._model_path, provider, provider_options=provider_options)
+        else:
+            self.model.set_providers([provider], provider_options=[provider_options])
         self.providers = self.model.get_providers()
+        self._use_cuda_graph = self._is_cuda_graph_enabled(self.model)
 
         return self
 
@@ -337,11 +404,19 @@ class ORTModel(OptimizedModel):
         provider: str = "CPUExecutionProvider",
         session_options: Optional[ort.SessionOptions] = None,
         provider_options: Optional[Dict[str, Any]] = None,
+        optimized_model_cache_dir: Optional[Union[str, Path]] = None,
+        use_session_cache: bool = False,
+        pre_optimized: bool = False,
+        dynamic_shapes: bool = False,
     ) -> ort.InferenceSession:
         """
         Loads an ONNX Inference session with a given provider. Default provider is `CPUExecutionProvider` to match the
         default behaviour in PyTorch/TensorFlow/JAX.
 
+        When no `session_options` are passed, the number of threads used by ONNX Runtime to parallelize the execution
+        within and across nodes can be set with the `ORT_INTRA_OP_THREADS` and `ORT_INTER_OP_THREADS` environment
+        variables, and the CPU memory arena can be disabled with `ORT_DISABLE_CPU_MEM_ARENA=1`.
+
         Args:
             path (`Union[str, Path]`):
                 Path of the ONNX model.
@@ -353,6 +428,23 @@ class ORTModel(OptimizedModel):
             provider_options (`Optional[Dict[str, Any]]`, defaults to `None`):
                 Provider option dictionary corresponding to the provider used. See available options
                 for each provider: https://onnxruntime.ai/docs/api/c/group___global.html .
+            optimized_model_cache_dir (`Optional[Union[str, Path]]`, defaults to `None`):
+                If set, the graph optimized by ONNX Runtime when creating the session is serialized in this directory,
+                and loaded with graph optimizations disabled on the next calls for the same model and provider. This
+                avoids running the graph optimizations again each time the model is loaded. With
+                `TensorrtExecutionProvider`, the TensorRT engines are cached in its `tensorrt` subdirectory instead,
+                unless `trt_engine_cache_enable` is set in `provider_options`.
+            use_session_cache (`bool`, defaults to `False`):
+                Whether to reuse the inference session already loaded in this process for the same model file, provider
+                and provider options, if any. Only applies when no `session_options` are passed.
+            pre_optimized (`bool`, defaults to `False`):
+                Whether all the ONNX Runtime graph optimizations for this provider were already applied offline to the
+                model, in which case they are disabled when creating the session. Only applies when no
+                `session_options` are passed.
+            dynamic_shapes (`bool`, defaults to `False`):
+                Whether the input shapes change from one call to the next, as for decoders in a generation loop. The
+                memory pattern optimization of ONNX Runtime, which plans the allocations from the shapes of the
+                previous call, is then disabled. Only applies when no `session_options` are passed.
         """
         validate_provider_availability(provider)  # raise error if the provider is not available
 
@@ -364,18 +456,132 @@ class ORTModel(OptimizedModel):
         if not isinstance(path, str):
             path = str(path)
 
+        if provider == "TensorrtExecutionProvider" and optimized_model_cache_dir is not None:
+            # The graph partitions compiled by TensorRT can not be serialized, the engines built for them are cached
+            # instead, which is where most of the session creation time goes
+            if provider_options is None or "trt_engine_cache_enable" not in provider_options:
+                provider_options = {
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": str(Path(optimized_model_cache_dir) / "tensorrt"),
+                    **(provider_options or {}),
+                }
+            optimized_model_cache_dir = None
+
         # `providers` and `provider_options` need to be of the same length
         if provider_options is not None:
             providers_options = [provider_options] + [{} for _ in range(len(providers) - 1)]
         else:
             providers_options = None
 
-        return ort.InferenceSession(
-            path,
-            providers=providers,
-            sess_options=session_options,
-            provider_options=providers_options,
+        # By default ONNX Runtime uses as many intra-op threads as physical cores, which oversubscribes the CPU when
+        # several sessions run in parallel, e.g. in pipeline workers
+        intra_op_num_threads = int(os.environ.get("ORT_INTRA_OP_THREADS", 0))
+        inter_op_num_threads = int(os.environ.get("ORT_INTER_OP_THREADS", 0))
+        # The arena keeps the largest chunks ever allocated, which trades a higher memory footprint for speed
+        disable_cpu_mem_arena = os.environ.get("ORT_DISABLE_CPU_MEM_ARENA", "0") == "1"
+
+        session_cache_key = None
+        if use_session_cache and session_options is None:
+            session_cache_key = (
+                os.path.realpath(path),
+                os.stat(path).st_mtime_ns,
+                tuple(providers),
+                tuple(sorted((str(key), str(value)) for key, value in (provider_options or {}).items())),
+                str(optimized_model_cache_dir),
+                pre_optimized,
+                dynamic_shapes,
+                intra_op_num_threads,
+                inter_op_num_threads,
+                disable_cpu_mem_arena,
+            )
+            session = _INFERENCE_SESSIONS_CACHE.get(session_cache_key)
+            if session is not None:
+                return session
+        elif use_session_cache:
+            logger.info("The inference session can not be reused when passing session options, a new one is created.")
+
+        if session_options is None and (
+            pre_optimized
+            or dynamic_shapes
+            or disable_cpu_mem_arena
+            or intra_op_num_threads > 0
+            or inter_op_num_threads > 0
+        ):
+            session_options = ort.SessionOptions()
+            if pre_optimized:
+                session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            if dynamic_shapes:
+                session_options.enable_mem_pattern = False
+            if disable_cpu_mem_arena:
+                session_options.enable_cpu_mem_arena = False
+            session_options.intra_op_num_threads = intra_op_num_threads
+            session_options.inter_op_num_threads = inter_op_num_threads
+            if inter_op_num_threads > 1:
+                # Inter-op threads are only used when running the graph nodes in parallel
+                session_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+
+        session = ORTModel._create_inference_session(
+            path, providers, session_options, providers_options, optimized_model_cache_dir
+        )
+        if session_cache_key is not None:
+            _INFERENCE_SESSIONS_CACHE[session_cache_key] = session
+
+        return session
+
+    @staticmethod
+    def _create_inference_session(
+        path: str,
+        providers: List[str],
+        session_options: Optional[ort.SessionOptions],
+        providers_options: Optional[List[Dict[str, Any]]],
+        optimized_model_cache_dir: Optional[Union[str, Path]],
+    ) -> ort.InferenceSession:
+        if optimized_model_cache_dir is None or (
+            session_options is not None and session_options.optimized_model_filepath != ""
+        ):
+            return ort.InferenceSession(
+                path,
+                providers=providers,
+                sess_options=session_options,
+                provider_options=providers_options,
+            )
+
+        if session_options is None:
+            session_options = ort.SessionOptions()
+
+        # The session options may be provided by the user and reused for other sessions, hence the values modified to
+        # handle the cache are restored once the session is created.
+        graph_optimization_level = session_options.graph_optimization_level
+        optimized_model_path = get_optimized_model_cache_path(
+            path, providers[0], optimized_model_cache_dir, graph_optimization_level
         )
+        load_path = path
+        try:
+            if optimized_model_path.is_file():
+                load_path = optimized_model_path.as_posix()
+                session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            elif any(Path(f"{path}{suffix}").is_file() for suffix in ("_data", ".data")):
+                # The external data is written next to the model by the ONNX export (`_data`) and by the ORT
+                # transformers optimizer (`.data`), checking for it spares parsing the whole model at each cache miss
+                logger.info(f"The ONNX model {path} uses external data, its optimized graph will not be cached.")
+            else:
+                optimized_model_path.parent.mkdir(parents=True, exist_ok=True)
+                session_options.optimized_model_filepath = optimized_model_path.as_posix()
+
+            session = ort.InferenceSession(
+                load_path,
+                providers=providers,
+                sess_options=session_options,
+                provider_options=providers_options,
+            )
+        finally:
+            session_options.graph_optimization_level = graph_optimization_level
+            session_options.optimized_model_filepath = ""
+
+        # The cached graph is an implementation detail: the session should still point to the original model, which is
+        # the one to save and to reload from when the providers are changed.
+        session._model_path = path
+        return session
 
     def _save_pretrained(self, save_directory: Union[str, Path]):
         """
@@ -394,13 +600,67 @@ class ORTModel(OptimizedModel):
         src_paths, dst_paths = _get_external_data_paths(src_paths, dst_paths)
 
         for src_path, dst_path in zip(src_paths, dst_paths):
-            shutil.copyfile(src_path, dst_path)
+            copy_file(src_path, dst_path)
+
+    @staticmethod
+    def _is_pre_optimized(model_dir: Path, file_name: str, provider: str) -> bool:
+        """
+        Checks whether the ONNX model `file_name` was produced by [`~onnxruntime.ORTOptimizer`] with all the ONNX Runtime
+        graph optimizations for `provider`, in which case they do not need to be applied again when loading it.
+        """
+        from .configuration import ORTConfig
+
+        ort_config_path = model_dir / ORTConfig.CONFIG_NAME
+        if not Path(file_name).stem.endswith("_optimized") or not ort_config_path.is_file():
+            return False
+
+        with open(ort_config_path, "r", encoding="utf-8") as f:
+            optimization = json.load(f).get("optimization") or {}
+
+        if provider == "CUDAExecutionProvider":
+            optimized_for_provider = optimization.get("optimize_for_gpu", False)
+        elif provider == "CPUExecutionProvider":
+            optimized_for_provider = not optimization.get("optimize_for_gpu", False)
+        else:
+            optimized_for_provider = False
+
+        return optimized_for_provider and optimization.get("optimization_level") == 99
 
     @staticmethod
     def _generate_regular_names_for_filename(filename: str):
         name, extension = filename.rsplit(".", maxsplit=1)
         return [filename, f"{name}_quantized.{extension}", f"{name}_optimized.{extension}"]
 
+    @classmethod
+    def _get_cached_snapshot_path(
+        cls,
+        model_id: str,
+        subfolder: str = "",
+        revision: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ) -> Optional[Path]:
+        """
+        Gets the snapshot of the model repo `model_id` in the Hugging Face Hub cache, located from the configuration
+        file it holds, or `None` if the repo is not cached. The ONNX files of the repo can be looked for in it when the
+        repo files can not be listed, without network access.
+        """
+        try:
+            config_cache_path = hf_hub_download(
+                repo_id=model_id,
+                filename=cls.config_name,
+                subfolder=subfolder,
+                revision=revision,
+                cache_dir=cache_dir,
+                local_files_only=True,
+            )
+        except EntryNotFoundError:
+            return None
+
+        snapshot_path = Path(config_cache_path).parent
+        for _ in Path(subfolder).parts:
+            snapshot_path = snapshot_path.parent
+        return snapshot_path
+
     @staticmethod
     def infer_onnx_filename(
         model_name_or_path: Union[str, Path],
@@ -457,6 +717,9 @@ class ORTModel(OptimizedModel):
         provider_options: Optional[Dict[str, Any]] = None,
         use_io_binding: Optional[bool] = None,
         model_save_dir: Optional[Union[str, Path, TemporaryDirectory]] = None,
+        use_session_cache: bool = False,
+        optimized_model_cache_dir: Optional[Union[str, Path]] = None,
+        preprocessors: Optional[List] = None,
         **kwargs,
     ) -> "ORTModel":
         model_path = Path(model_id)
@@ -465,6 +728,18 @@ class ORTModel(OptimizedModel):
         if file_name is None:
             if model_path.is_dir():
                 onnx_files = list(model_path.glob("*.onnx"))
+            elif local_files_only:
+                # The repository files can not be listed without network access, the ONNX files are looked for in the
+                # cached snapshot of the repository instead
+                snapshot_path = cls._get_cached_snapshot_path(
+                    model_id, subfolder=subfolder, revision=revision, cache_dir=cache_dir
+                )
+                if snapshot_path is None:
+                    raise FileNotFoundError(
+                        f"Could not find {model_id} in the local cache to look for its ONNX model file, specify which "
+                        "one to load by using the file_name argument."
+                    )
+                onnx_files = list((snapshot_path / subfolder).glob("*.onnx"))
             else:
                 if isinstance(use_auth_token, bool):
                     token = HfFolder().get_token()
@@ -490,49 +765,59 @@ class ORTModel(OptimizedModel):
                 "not behave as expected."
             )
 
-        preprocessors = None
         if model_path.is_dir():
             model = ORTModel.load_model(
                 model_path / file_name,
                 provider=provider,
                 session_options=session_options,
                 provider_options=provider_options,
+                use_session_cache=use_session_cache,
+                optimized_model_cache_dir=optimized_model_cache_dir,
+                pre_optimized=ORTModel._is_pre_optimized(model_path, file_name, provider),
             )
             new_model_save_dir = model_path
-            preprocessors = maybe_load_preprocessors(model_id)
+            if preprocessors is None:
+                preprocessors = maybe_load_preprocessors(model_id)
         else:
-            model_cache_path = hf_hub_download(
-                repo_id=model_id,
-                filename=file_name,
-                subfolder=subfolder,
-                use_auth_token=use_auth_token,
-                revision=revision,
-                cache_dir=cache_dir,
-                force_download=force_download,
-                local_files_only=local_files_only,
-            )
-
-            # try download external data
-            try:
-                hf_hub_download(
-                    repo_id=model_id,
-                    subfolder=subfolder,
-                    filename=file_name + "_data",
-                    use_auth_token=use_auth_token,
-                    revision=revision,
-                    cache_dir=cache_dir,
-                    force_download=force_download,
-                    local_files_only=local_files_only,
+            download_kwargs = {
+                "repo_id": model_id,
+                "subfolder": subfolder,
+                "use_auth_token": use_auth_token,
+                "revision": revision,
+                "cache_dir": cache_dir,
+                "force_download": force_download,
+                "local_files_only": local_files_only,
+            }
+            # The ONNX file, its external data and the preprocessors are independent requests to the Hub, hence they
+            # are resolved concurrently rather than paying the round-trip latency of each in turn
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                model_future = executor.submit(hf_hub_download, filename=file_name, **download_kwargs)
+                external_data_future = executor.submit(
+                    hf_hub_download, filename=file_name + "_data", **download_kwargs
                 )
-            except EntryNotFoundError:
-                # model doesn't use external data
-                pass
+                preprocessors_future = None
+                if preprocessors is None:
+                    preprocessors_future = executor.submit(maybe_load_preprocessors, model_id, subfolder=subfolder)
+
+                model_cache_path = model_future.result()
+                # try download external data
+                try:
+                    external_data_future.result()
+                except EntryNotFoundError:
+                    # model doesn't use external data
+                    pass
+                if preprocessors_future is not None:
+                    preprocessors = preprocessors_future.result()
 
             model = ORTModel.load_model(
-                model_cache_path, provider=provider, session_options=session_options, provider_options=provider_options
+                model_cache_path,
+                provider=provider,
+                session_options=session_options,
+                provider_options=provider_options,
+                use_session_cache=use_session_cache,
+                optimized_model_cache_dir=optimized_model_cache_dir,
             )
             new_model_save_dir = Path(model_cache_path).parent
-            preprocessors = maybe_load_preprocessors(model_id, subfolder=subfolder)
 
         # model_save_dir can be provided in kwargs as a TemporaryDirectory instance, in which case we want to keep it
         # instead of the path only.
@@ -587,11 +872,14 @@ class ORTModel(OptimizedModel):
         )
 
         config.save_pretrained(save_dir_path)
-        maybe_save_preprocessors(model_id, save_dir_path, src_subfolder=subfolder)
+        # The preprocessors are saved alongside the exported model, and passed as is instead of being loaded back
+        preprocessors = maybe_save_preprocessors(model_id, save_dir_path, src_subfolder=subfolder)
 
         return cls._from_pretrained(
             save_dir_path,
             config,
+            file_name=ONNX_WEIGHTS_NAME,
+            preprocessors=preprocessors,
             use_io_binding=use_io_binding,
             model_save_dir=save_dir,
             provider=provider,
@@ -621,13 +909,25 @@ class ORTModel(OptimizedModel):
             ONNX Runtime provider to use for loading the model. See https://onnxruntime.ai/docs/execution-providers/ for
             possible providers.
         session_options (`Optional[onnxruntime.SessionOptions]`, defaults to `None`),:
-            ONNX Runtime session options to use for loading the model.
+            ONNX Runtime session options to use for loading the model, for instance to set `intra_op_num_threads` or
+            to disable `enable_cpu_mem_arena` and `enable_mem_pattern` to reduce the memory footprint.
         provider_options (`Optional[Dict[str, Any]]`, defaults to `None`):
             Provider option dictionaries corresponding to the provider used. See available options
             for each provider: https://onnxruntime.ai/docs/api/c/group___global.html .
         kwargs (`Dict[str, Any]`):
             Will be passed to the underlying model loading methods.
 
+        > Parameters for single-session models (ORTModelForFeatureExtraction, ORTModelForSequenceClassification, ...)
+
+        use_session_cache (`bool`, defaults to `False`):
+            Whether to reuse the ONNX Runtime inference session already loaded in the process for the same ONNX file
+            and provider, for instance when instantiating several models from the same repository. Only applies when
+            no `session_options` are passed.
+        optimized_model_cache_dir (`Optional[Union[str, Path]]`, defaults to `None`):
+            If set, the graph optimized by ONNX Runtime for the provider (or the TensorRT engines when using
+            `TensorrtExecutionProvider`) is cached in this directory, so that the next loads of the same model skip
+            the graph optimizations.
+
         > Parameters for decoder models (ORTModelForCausalLM, ORTModelForSeq2SeqLM, ORTModelForSeq2SeqLM, ORTModelForSpeechSeq2Seq, ORTModelForVision2Seq)
 
         use_cache (`Optional[bool]`, defaults to `True`):
@@ -658,9 +958,104 @@ class ORTModel(OptimizedModel):
             **kwargs,
         )
 
+    @staticmethod
+    def _get_io_metadata(
+        model: ort.InferenceSession,
+    ) -> SessionIOMetadata:
+        """
+        Gets the inputs and outputs of an inference session, along with the mapping from their names to their NumPy
+        and ONNX Runtime data types and the ordered list of the output names. The result is cached for the lifetime of
+        the session.
+        """
+        io_metadata = _SESSIONS_IO_METADATA.get(model)
+        if io_metadata is None:
+            inputs = tuple(model.get_inputs())
+            outputs = tuple(model.get_outputs())
+            name_to_ort_type = {node.name: node.type for node in inputs + outputs}
+            output_names = [node.name for node in outputs]
+            io_metadata = SessionIOMetadata(
+                inputs=inputs,
+                outputs=outputs,
+                name_to_np_type=TypeHelper.get_io_numpy_type_map(model),
+                name_to_ort_type=name_to_ort_type,
+                output_names=output_names,
+            )
+            _SESSIONS_IO_METADATA[model] = io_metadata
+        return io_metadata
+
+    @staticmethod
+    def _tensors_to_numpy(*tensors: Optional[torch.Tensor]) -> Tuple[Optional[np.ndarray], ...]:
+        """
+        Converts PyTorch tensors to NumPy arrays, `None` values being left untouched. Tensors located on the same
+        accelerator and sharing the same shape and dtype (e.g. `input_ids`, `attention_mask` and `token_type_ids`) are
+        stacked on device first, so that they are moved to the host with a single copy.
+        """
+        present_tensors = [tensor for tensor in tensors if tensor is not None]
+        if (
+            len(present_tensors) > 1
+            and present_tensors[0].device.type != "cpu"
+            and all(
+                tensor.device == present_tensors[0].device
+                and tensor.dtype == present_tensors[0].dtype
+                and tensor.shape == present_tensors[0].shape
+                for tensor in present_tensors[1:]
+            )
+        ):
+            arrays = iter(torch.stack(present_tensors).detach().cpu().numpy())
+        else:
+            # Tensors on CPU not requiring grad share their memory with the NumPy array without going through autograd
+            arrays = iter(
+                [
+                    tensor.numpy()
+                    if tensor.device.type == "cpu" and not tensor.requires_grad
+                    else tensor.detach().cpu().numpy()
+                    for tensor in present_tensors
+                ]
+            )
+        return tuple(None if tensor is None else next(arrays) for tensor in tensors)
+
+    def _run_inference(
+        self,
+        onnx_inputs: Dict[str, np.ndarray],
+        use_torch: bool,
+        model: Optional[ort.InferenceSession] = None,
+    ) -> List[Union[np.ndarray, torch.Tensor]]:
+        """
+        Runs the inference session `model` (defaults to `self.model`) without IO Binding. If `use_torch` is set, the
+        outputs are returned as PyTorch CPU tensors, to be moved to the model device by the caller.
+
+        When ONNX Runtime supports DLPack (`onnxruntime-training`), the outputs are exchanged with PyTorch without being
+        first copied into NumPy arrays.
+        """
+        if model is None:
+            model = self.model
+
+        # Passing the cached output names spares ONNX Runtime from rebuilding the list from the session metadata at
+        # each call, which adds up over the hundreds of forward passes of a generation loop
+        output_names = self._get_io_metadata(model).output_names
+
+        if not use_torch:
+            return model.run(output_names, onnx_inputs)
+
+        if _ORT_VALUE_SUPPORTS_DLPACK:
+            ort_inputs = {name: ort.OrtValue.ortvalue_from_numpy(value) for name, value in onnx_inputs.items()}
+            ort_outputs = model.run_with_ort_values(output_names, ort_inputs)
+            # DLPack does not support booleans, such outputs go through NumPy as in `IOBindingHelper.to_pytorch_via_cupy`
+            return [
+                torch.from_numpy(output.numpy())
+                if output.data_type() == "tensor(bool)"
+                else torch.from_dlpack(output.to_dlpack())
+                for output in ort_outputs
+            ]
+
+        return [
+            torch.from_numpy(output) if isinstance(output, np.ndarray) else output
+            for output in model.run(output_names, onnx_inputs)
+        ]
+
     def _prepare_output_buffer(self, model: ort.InferenceSession, output_shape: Tuple[int], output_name: str):
         """Prepares the buffer of output_name with a 1D tensor."""
-        ort_type = TypeHelper.get_output_type(model, output_name)
+        ort_type = self._get_io_metadata(model).name_to_ort_type[output_name]
         torch_type = TypeHelper.ort_type_to_torch_type(ort_type)
         if len(output_shape) > 0:
             output_buffer = torch.empty(np.prod(output_shape), dtype=torch_type, device=self.device).contiguous()
@@ -719,6 +1114,7 @@ class ORTModel(OptimizedModel):
         ordered_input_names: List[str],
         known_output_shapes: Optional[Dict[str, Tuple[int]]] = None,
         outputs_to_not_bind: Optional[Union[Set[str], str]] = None,
+        reuse_output_buffers: bool = False,
     ) -> Tuple[ort.IOBinding, Dict[str, Tuple[int]], Dict[str, torch.Tensor]]:
         """
         Prepares IO binding for ONNX Runtime.
@@ -735,6 +1131,9 @@ class ORTModel(OptimizedModel):
                 values. It is possible to explicitely pass the shape via this argument.
             outputs_to_not_bind (`Optional[Union[Set[str], str]]`, defaults to `None`):
                 The names of the outputs that should not be bound.
+            reuse_output_buffers (`bool`, defaults to `False`):
+                Whether to bind the outputs to the buffers allocated for the previous call when their size match,
+                instead of allocating new ones.
 
         Returns:
             `Tuple[ort.IOBinding, Dict[str, Tuple[int]], Dict[str, torch.Tensor]`: The IOBinding object, a dictionary
@@ -742,26 +1141,43 @@ class ORTModel(OptimizedModel):
 
         """
         io_binding = model.io_binding()
+        # ONNX Runtime expects an integer device id, also for CPU
+        device_index = self.device.index or 0
 
-        name_to_np_type = TypeHelper.get_io_numpy_type_map(model)
+        io_metadata = self._get_io_metadata(model)
+        model_inputs_nodes, model_outputs_nodes = io_metadata.inputs, io_metadata.outputs
+        name_to_np_type = io_metadata.name_to_np_type
 
         input_name_to_tensor = {}
+        # Only the data pointers are bound, so the tensors copied here need to be kept alive as long as the IOBinding
+        bound_tensors = []
+        copy_to_device = False
         for idx, tensor in enumerate(model_inputs):
             if tensor is None:
                 continue
             name = ordered_input_names[idx]
             input_name_to_tensor[name] = tensor
             tensor = tensor.contiguous()
+            if self.device.type == "cuda" and tensor.device.type == "cpu":
+                # Asynchronous copies from page-locked memory, instead of a synchronous copy from pageable memory done
+                # by ONNX Runtime for each input
+                tensor = tensor.pin_memory().to(self.device, non_blocking=True)
+                copy_to_device = True
+            bound_tensors.append(tensor)
             io_binding.bind_input(
                 name,
                 tensor.device.type,
-                self.device.index,
+                device_index,
                 name_to_np_type[name],
                 tuple(tensor.shape),
                 tensor.data_ptr(),
             )
+        if copy_to_device:
+            self._wait_for_device_copies(model)
+        io_binding._bound_tensors = bound_tensors
+
         dimensions = {}
-        for input_ in model.get_inputs():
+        for input_ in model_inputs_nodes:
             shape = input_.shape
             for idx, axis in enumerate(shape):
                 if isinstance(axis, str):
@@ -778,7 +1194,7 @@ class ORTModel(OptimizedModel):
         elif isinstance(outputs_to_not_bind, str):
             outputs_to_not_bind = {outputs_to_not_bind}
 
-        for output_node in model.get_outputs():
+        for output_node in model_outputs_nodes:
             output_name = output_node.name
             if output_name in outputs_to_not_bind:
                 continue
@@ -788,12 +1204,22 @@ class ORTModel(OptimizedModel):
                 output_shape = []
                 for axis_name in output_node.shape:
                     output_shape.append(self._output_shape_inference(axis_name, dimensions))
-            output_buffer = self._prepare_output_buffer(model, output_shape, output_name)
+            output_buffer = None
+            if reuse_output_buffers:
+                output_buffer = self._output_buffers.get(output_name)
+                if output_buffer is not None and (
+                    output_buffer.device != self.device or output_buffer.numel() != int(np.prod(output_shape))
+                ):
+                    output_buffer = None
+            if output_buffer is None:
+                output_buffer = self._prepare_output_buffer(model, output_shape, output_name)
+                if reuse_output_buffers:
+                    self._output_buffers[output_name] = output_buffer
 
             io_binding.bind_output(
                 output_name,
                 output_buffer.device.type,
-                self.device.index,
+                device_index,
                 name_to_np_type[output_name],
                 output_shape,
                 output_buffer.data_ptr(),
@@ -803,8 +1229,91 @@ class ORTModel(OptimizedModel):
 
         return io_binding, output_shapes, output_buffers
 
+    @staticmethod
+    def _is_cuda_graph_enabled(model: ort.InferenceSession) -> bool:
+        """
+        Whether the CUDA execution provider of the inference session captures its kernels into a CUDA graph, replayed
+        on the next runs.
+        """
+        provider_options = model.get_provider_options().get("CUDAExecutionProvider", {})
+        return provider_options.get("enable_cuda_graph", "0") == "1"
+
+    def _raise_if_cuda_graph_enabled(self, *sessions: Optional[ort.InferenceSession]):
+        """
+        Raises an error if one of the inference sessions of an encoder-decoder or decoder model captures a CUDA graph.
+        The shapes of the decoder inputs change at each generation step, which ONNX Runtime can not replay.
+        """
+        if any(self._is_cuda_graph_enabled(session) for session in sessions if session is not None):
+            raise ValueError(
+                f"The enable_cuda_graph option of CUDAExecutionProvider is not supported by {self.__class__.__name__}, "
+                "as the sequence length of the decoder inputs changes at each generation step."
+            )
+
+    def _wait_for_device_copies(self, model: ort.InferenceSession):
+        """
+        Makes the inference session `model` wait for the inputs copied by PyTorch on its current CUDA stream.
+        """
+        current_stream = torch.cuda.current_stream(self.device)
+        user_compute_stream = model.get_provider_options().get("CUDAExecutionProvider", {}).get("user_compute_stream")
+        if user_compute_stream is not None and int(user_compute_stream) != 0:
+            # ONNX Runtime runs on the stream passed with `user_compute_stream`, which can wait for the copies on the
+            # device instead of blocking the host
+            ort_stream = torch.cuda.ExternalStream(int(user_compute_stream), device=self.device)
+            if ort_stream != current_stream:
+                ort_stream.wait_stream(current_stream)
+        else:
+            # ONNX Runtime does not run on the PyTorch CUDA stream
+            current_stream.synchronize()
+
     def prepare_io_binding(self, *model_inputs, ordered_input_names):
-        return self._prepare_io_binding(self.model, ordered_input_names=ordered_input_names, *model_inputs)
+        if self.io_binding_cache_size <= 0 and not self._use_cuda_graph:
+            return self._prepare_io_binding(
+                self.model,
+                *model_inputs,
+                ordered_input_names=ordered_input_names,
+                reuse_output_buffers=self.reuse_output_buffers,
+            )
+
+        cache_key = tuple(
+            None if tensor is None else (tuple(tensor.shape), tensor.dtype, tensor.device) for tensor in model_inputs
+        )
+        cached_io_binding = self._io_bindings_cache.get(cache_key)
+        if cached_io_binding is not None:
+            self._io_bindings_cache.move_to_end(cache_key)
+            io_binding = cached_io_binding[0]
+            for bound_tensor, tensor in zip(
+                io_binding._bound_tensors, (tensor for tensor in model_inputs if tensor is not None)
+            ):
+                if bound_tensor.device.type == "cuda" and tensor.device.type == "cpu":
+                    # Copies from pageable memory are synchronous even with `non_blocking=True`, while the page-locked
+                    # staging buffers are reused across calls by the PyTorch caching host allocator
+                    tensor = tensor.pin_memory()
+                bound_tensor.copy_(tensor, non_blocking=True)
+            if self.device.type == "cuda":
+                self._wait_for_device_copies(self.model)
+            return cached_io_binding
+
+        if self._use_cuda_graph and len(self._io_bindings_cache) > 0:
+            raise ValueError(
+                f"The CUDA graph of {self.__class__.__name__} was captured for the input shapes "
+                f"{next(iter(self._io_bindings_cache))}, but got {cache_key}. Please pad the inputs to fixed shapes."
+            )
+
+        # The bound input buffers are written to by the next calls, hence the caller tensors can not be bound directly
+        model_inputs = [
+            None if tensor is None else tensor.to(self.device, memory_format=torch.contiguous_format, copy=True)
+            for tensor in model_inputs
+        ]
+        cached_io_binding = self._prepare_io_binding(
+            self.model,
+            *model_inputs,
+            ordered_input_names=ordered_input_names,
+        )
+        self._io_bindings_cache[cache_key] = cached_io_binding
+        if len(self._io_bindings_cache) > max(self.io_binding_cache_size, 1):
+            self._io_bindings_cache.popitem(last=False)
+
+        return cached_io_binding
 
     def raise_on_numpy_input_io_binding(self, use_torch: bool):
         """
@@ -887,7 +1396,10 @@ class ORTModelForFeatureExtraction(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -906,10 +1418,9 @@ class ORTModelForFeatureExtraction(ORTModel):
             )
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             onnx_inputs = {
                 "input_ids": input_ids,
@@ -918,11 +1429,11 @@ class ORTModelForFeatureExtraction(ORTModel):
             if token_type_ids is not None:
                 onnx_inputs["token_type_ids"] = token_type_ids
 
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
             last_hidden_state = outputs[self.output_names["last_hidden_state"]]
             if use_torch:
-                last_hidden_state = torch.from_numpy(last_hidden_state).to(self.device)
+                last_hidden_state = last_hidden_state.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return BaseModelOutput(last_hidden_state=last_hidden_state)
@@ -994,7 +1505,10 @@ class ORTModelForMaskedLM(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -1011,10 +1525,9 @@ class ORTModelForMaskedLM(ORTModel):
             return MaskedLMOutput(logits=output_buffers["logits"].view(output_shapes["logits"]))
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             # converts pytorch inputs into numpy inputs for onnx
             onnx_inputs = {
@@ -1025,11 +1538,11 @@ class ORTModelForMaskedLM(ORTModel):
                 onnx_inputs["token_type_ids"] = token_type_ids
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
-            logits = outputs[self.output_names["logits"]]
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
+            logits = outputs[self._logits_idx]
 
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return MaskedLMOutput(logits=logits)
@@ -1102,7 +1615,10 @@ class ORTModelForQuestionAnswering(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -1122,10 +1638,9 @@ class ORTModelForQuestionAnswering(ORTModel):
             )
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             # converts pytorch inputs into numpy inputs for onnx
             onnx_inputs = {
@@ -1136,13 +1651,13 @@ class ORTModelForQuestionAnswering(ORTModel):
                 onnx_inputs["token_type_ids"] = token_type_ids
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
             start_logits = outputs[self.output_names["start_logits"]]
             end_logits = outputs[self.output_names["end_logits"]]
             if use_torch:
-                start_logits = torch.from_numpy(start_logits).to(self.device)
-                end_logits = torch.from_numpy(end_logits).to(self.device)
+                start_logits = start_logits.to(self.device)
+                end_logits = end_logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return QuestionAnsweringModelOutput(start_logits=start_logits, end_logits=end_logits)
@@ -1230,7 +1745,10 @@ class ORTModelForSequenceClassification(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -1247,10 +1765,9 @@ class ORTModelForSequenceClassification(ORTModel):
             return SequenceClassifierOutput(logits=output_buffers["logits"].view(output_shapes["logits"]))
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             onnx_inputs = {
                 "input_ids": input_ids,
@@ -1259,11 +1776,11 @@ class ORTModelForSequenceClassification(ORTModel):
             if token_type_ids is not None:
                 onnx_inputs["token_type_ids"] = token_type_ids
 
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return SequenceClassifierOutput(logits=logits)
@@ -1336,7 +1853,10 @@ class ORTModelForTokenClassification(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -1353,10 +1873,9 @@ class ORTModelForTokenClassification(ORTModel):
             return TokenClassifierOutput(logits=output_buffers["logits"].view(output_shapes["logits"]))
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             # converts pytorch inputs into numpy inputs for onnx
             onnx_inputs = {
@@ -1367,11 +1886,11 @@ class ORTModelForTokenClassification(ORTModel):
                 onnx_inputs["token_type_ids"] = token_type_ids
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
-            logits = outputs[self.output_names["logits"]]
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
+            logits = outputs[self._logits_idx]
 
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return TokenClassifierOutput(logits=logits)
@@ -1439,7 +1958,10 @@ class ORTModelForMultipleChoice(ORTModel):
         use_torch = isinstance(input_ids, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if not self._has_token_type_ids:
+            token_type_ids = None
+
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_ids,
                 attention_mask,
@@ -1456,10 +1978,9 @@ class ORTModelForMultipleChoice(ORTModel):
             return MultipleChoiceModelOutput(logits=output_buffers["logits"].view(output_shapes["logits"]))
         else:
             if use_torch:
-                input_ids = input_ids.cpu().detach().numpy()
-                attention_mask = attention_mask.cpu().detach().numpy()
-                if token_type_ids is not None:
-                    token_type_ids = token_type_ids.cpu().detach().numpy()
+                input_ids, attention_mask, token_type_ids = self._tensors_to_numpy(
+                    input_ids, attention_mask, token_type_ids
+                )
 
             onnx_inputs = {
                 "input_ids": input_ids,
@@ -1469,11 +1990,11 @@ class ORTModelForMultipleChoice(ORTModel):
                 onnx_inputs["token_type_ids"] = token_type_ids
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
-            logits = outputs[self.output_names["logits"]]
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
+            logits = outputs[self._logits_idx]
 
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return MultipleChoiceModelOutput(logits=logits)
@@ -1547,7 +2068,7 @@ class ORTModelForImageClassification(ORTModel):
         use_torch = isinstance(pixel_values, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 pixel_values, ordered_input_names=self._ordered_input_names
             )
@@ -1568,11 +2089,11 @@ class ORTModelForImageClassification(ORTModel):
             }
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
-            logits = outputs[self.output_names["logits"]]
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
+            logits = outputs[self._logits_idx]
 
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return ImageClassifierOutput(logits=logits)
@@ -1642,7 +2163,7 @@ class ORTModelForSemanticSegmentation(ORTModel):
         use_torch = isinstance(next(iter(kwargs.values())), torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if self.use_io_binding:
             io_binding = IOBindingHelper.prepare_io_binding(
                 self,
                 **kwargs,
@@ -1664,11 +2185,11 @@ class ORTModelForSemanticSegmentation(ORTModel):
             onnx_inputs = self._prepare_onnx_inputs(use_torch=use_torch, **kwargs)
 
             # run inference
-            onnx_outputs = self.model.run(None, onnx_inputs)
+            onnx_outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = onnx_outputs[self.output_names["logits"]]
+            logits = onnx_outputs[self._logits_idx]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return SemanticSegmenterOutput(logits=logits)
@@ -1758,7 +2279,7 @@ class ORTModelForAudioClassification(ORTModel):
     ):
         use_torch = isinstance(input_values, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
-        if self.device.type == "cuda" and self.use_io_binding:
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_values, ordered_input_names=self._ordered_input_names
             )
@@ -1782,11 +2303,11 @@ class ORTModelForAudioClassification(ORTModel):
                 }
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return SequenceClassifierOutput(logits=logits)
@@ -1863,11 +2384,11 @@ class ORTModelForCTC(ORTModel):
                 }
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
             # converts output to namedtuple for pipelines post-processing
             return CausalLMOutput(logits=logits)
 
@@ -1935,7 +2456,7 @@ class ORTModelForAudioXVector(ORTModel):
     ):
         use_torch = isinstance(input_values, torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
-        if self.device.type == "cuda" and self.use_io_binding:
+        if self.use_io_binding:
             io_binding, output_shapes, output_buffers = self.prepare_io_binding(
                 input_values, ordered_input_names=self._ordered_input_names
             )
@@ -1962,13 +2483,13 @@ class ORTModelForAudioXVector(ORTModel):
                 }
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             embeddings = outputs[self.output_names["embeddings"]]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
-                embeddings = torch.from_numpy(embeddings).to(self.device)
+                logits = logits.to(self.device)
+                embeddings = embeddings.to(self.device)
 
             # converts output to namedtuple for pipelines post-processing
             return XVectorOutput(logits=logits, embeddings=embeddings)
@@ -2044,11 +2565,11 @@ class ORTModelForAudioFrameClassification(ORTModel):
                 }
 
             # run inference
-            outputs = self.model.run(None, onnx_inputs)
+            outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
 
-            logits = outputs[self.output_names["logits"]]
+            logits = outputs[self._logits_idx]
             if use_torch:
-                logits = torch.from_numpy(logits).to(self.device)
+                logits = logits.to(self.device)
             # converts output to namedtuple for pipelines post-processing
             return TokenClassifierOutput(logits=logits)
 
@@ -2108,7 +2629,7 @@ class ORTModelForCustomTasks(ORTModel):
         use_torch = isinstance(next(iter(kwargs.values())), torch.Tensor)
         self.raise_on_numpy_input_io_binding(use_torch)
 
-        if self.device.type == "cuda" and self.use_io_binding:
+        if self.use_io_binding:
             io_binding = IOBindingHelper.prepare_io_binding(
                 self,
                 **kwargs,
@@ -2131,7 +2652,7 @@ class ORTModelForCustomTasks(ORTModel):
             onnx_inputs = self._prepare_onnx_inputs(use_torch=use_torch, **kwargs)
 
             # run inference
-            onnx_outputs = self.model.run(None, onnx_inputs)
+            onnx_outputs = self._run_inference(onnx_inputs, use_torch=use_torch)
             outputs = self._prepare_onnx_outputs(onnx_outputs, use_torch=use_torch)
 
             # converts output to namedtuple for pipelines post-processing
@@ -2155,6 +2676,6 @@ class ORTModelForCustomTasks(ORTModel):
             outputs[output] = onnx_outputs[idx]
 
             if use_torch:
-                outputs[output] = torch.from_numpy(outputs[output]).to(self.device)
+                outputs[output] = outputs[output].to(self.device)
 
         return outputs
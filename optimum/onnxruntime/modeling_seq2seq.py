@@ -17,7 +17,6 @@ Transformers.
 """
 
 import logging
-import shutil
 from abc import ABC, ABCMeta, abstractmethod
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -41,7 +40,7 @@ import onnxruntime as ort
 from ..exporters.onnx import main_export
 from ..onnx.utils import _get_external_data_paths
 from ..utils import check_if_transformers_greater
-from ..utils.file_utils import validate_file_exists
+from ..utils.file_utils import copy_file, validate_file_exists
 from ..utils.normalized_config import NormalizedConfigManager
 from ..utils.save_utils import maybe_load_preprocessors, maybe_save_preprocessors
 from .base import ORTDecoderForSeq2Seq, ORTEncoder
@@ -479,6 +478,8 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
 
         ABC.__init__(self)
 
+        self._raise_if_cuda_graph_enabled(encoder_session, decoder_session, decoder_with_past_session)
+
         if use_io_binding is None:
             if decoder_session.get_providers()[0] == "CUDAExecutionProvider":
                 use_io_binding = True
@@ -587,14 +588,17 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
                 for each provider: https://onnxruntime.ai/docs/api/c/group___global.html . Defaults to `None`.
         """
         encoder_session = ORTModel.load_model(encoder_path, provider, session_options, provider_options)
-        decoder_session = ORTModel.load_model(decoder_path, provider, session_options, provider_options)
+        # The sequence length of the decoders changes at each generation step
+        decoder_session = ORTModel.load_model(
+            decoder_path, provider, session_options, provider_options, dynamic_shapes=True
+        )
 
         decoder_with_past_session = None
         # If a decoder_with_past_path is provided, an inference session for the decoder with past key/values as inputs
         # will be enabled
         if decoder_with_past_path is not None:
             decoder_with_past_session = ORTModel.load_model(
-                decoder_with_past_path, provider, session_options, provider_options
+                decoder_with_past_path, provider, session_options, provider_options, dynamic_shapes=True
             )
 
         return encoder_session, decoder_session, decoder_with_past_session
@@ -617,7 +621,7 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
         src_paths, dst_paths = _get_external_data_paths(src_paths, dst_paths)
 
         for src_path, dst_path in zip(src_paths, dst_paths):
-            shutil.copyfile(src_path, dst_path)
+            copy_file(src_path, dst_path)
 
         self.generation_config.save_pretrained(save_directory)
 
@@ -646,6 +650,16 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
     ):
         model_path = Path(model_id)
 
+        # The repository files can not be listed without network access, the ONNX files are looked for in the cached
+        # snapshot of the repository instead
+        onnx_files_source = model_id
+        if local_files_only and not model_path.is_dir():
+            onnx_files_source = cls._get_cached_snapshot_path(
+                model_id, subfolder=subfolder, revision=revision, cache_dir=cache_dir
+            )
+            if onnx_files_source is None:
+                raise FileNotFoundError(f"Could not find {model_id} in the local cache to look for its ONNX files.")
+
         # We do not implement the logic for use_cache=False, use_merged=True
         if use_cache is False:
             if use_merged is True:
@@ -661,7 +675,7 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
         if use_merged is not False:
             try:
                 decoder_merged_path = ORTModelForConditionalGeneration.infer_onnx_filename(
-                    model_id,
+                    onnx_files_source,
                     [DECODER_MERGED_ONNX_FILE_PATTERN],
                     argument_name=None,
                     subfolder=subfolder,
@@ -682,9 +696,9 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
         decoder_without_past_path = None
         decoder_with_past_path = None
         if use_merged is False:
-            if not validate_file_exists(model_id, decoder_file_name, subfolder=subfolder, revision=revision):
+            if not validate_file_exists(onnx_files_source, decoder_file_name, subfolder=subfolder, revision=revision):
                 decoder_without_past_path = ORTModelForConditionalGeneration.infer_onnx_filename(
-                    model_id,
+                    onnx_files_source,
                     [DECODER_ONNX_FILE_PATTERN],
                     "decoder_file_name",
                     subfolder=subfolder,
@@ -708,11 +722,11 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
             # If the decoder without / with past has been merged, we do not need to look for any additional file
             if use_cache is True and use_merged is False:
                 if not validate_file_exists(
-                    model_id, decoder_with_past_file_name, subfolder=subfolder, revision=revision
+                    onnx_files_source, decoder_with_past_file_name, subfolder=subfolder, revision=revision
                 ):
                     try:
                         decoder_with_past_path = ORTModelForConditionalGeneration.infer_onnx_filename(
-                            model_id,
+                            onnx_files_source,
                             [DECODER_WITH_PAST_ONNX_FILE_PATTERN],
                             "decoder_with_past_file_name",
                             subfolder=subfolder,
@@ -740,9 +754,9 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
                         f"the {cls.__name__} might not behave as expected."
                     )
 
-        if not validate_file_exists(model_id, encoder_file_name, subfolder=subfolder, revision=revision):
+        if not validate_file_exists(onnx_files_source, encoder_file_name, subfolder=subfolder, revision=revision):
             encoder_path = ORTModelForConditionalGeneration.infer_onnx_filename(
-                model_id,
+                onnx_files_source,
                 [ENCODER_ONNX_FILE_PATTERN],
                 "encoder_file_name",
                 subfolder=subfolder,
@@ -873,7 +887,7 @@ class ORTModelForConditionalGeneration(ORTModel, ABC):
         config: "PretrainedConfig",
         use_auth_token: Optional[Union[bool, str]] = None,
         revision: str = "main",
-        force_download: bool = True,
+        force_download: bool = False,
         cache_dir: Optional[str] = None,
         subfolder: str = "",
         local_files_only: bool = False,
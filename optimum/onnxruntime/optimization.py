@@ -165,6 +165,13 @@ class ORTOptimizer:
         model_type = ORTConfigManager.get_model_ort_type(self.config.model_type)
         optimization_options = optimization_config.create_fusion_options(model_type)
 
+        if optimization_config.fp16 and not optimization_config.enable_transformers_specific_optimizations:
+            logger.warning(
+                "Converting the model to float16 without transformers-specific optimizations, the Attention, "
+                "LayerNormalization and Gelu subgraphs will not be fused and may be surrounded by many Cast nodes. "
+                "Consider setting enable_transformers_specific_optimizations=True."
+            )
+
         logger.info("Optimizing model...")
 
         # TODO: this is quite inefficient as we load in memory if models are <2GB without external data
@@ -199,9 +206,12 @@ class ORTOptimizer:
                 )
 
                 if optimization_config.fp16:
-                    # keep_io_types to keep inputs/outputs as float32
+                    # The conversion is done once all the fusions have been applied on the float32 graph, as the fusion
+                    # patterns are not matched anymore once Cast nodes are inserted around the float32-only operators.
                     optimizer.convert_float_to_float16(
-                        use_symbolic_shape_infer=not optimization_config.disable_shape_inference, keep_io_types=True
+                        use_symbolic_shape_infer=not optimization_config.disable_shape_inference,
+                        keep_io_types=optimization_config.fp16_keep_io_types,
+                        op_block_list=optimization_config.fp16_op_block_list,
                     )
             except Exception as e:
                 if "Incomplete symbolic shape inference" in str(e):
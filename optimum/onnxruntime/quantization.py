@@ -13,9 +13,11 @@
 #  limitations under the License.
 """Classes handling quantization with ONNX Runtime."""
 
+import copy
 import logging
 import os
 from collections import defaultdict
+from inspect import signature
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
 
@@ -25,7 +27,7 @@ from packaging.version import Version, parse
 from transformers import AutoConfig
 
 from onnxruntime import __version__ as ort_version
-from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantizationMode, QuantType
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantizationMode, QuantType, quantize_dynamic
 from onnxruntime.quantization.onnx_quantizer import ONNXQuantizer
 from onnxruntime.quantization.qdq_quantizer import QDQQuantizer
 
@@ -37,6 +39,7 @@ from .modeling_decoder import ORTModelForCausalLM
 from .modeling_ort import ORTModel
 from .modeling_seq2seq import ORTModelForConditionalGeneration
 from .preprocessors import QuantizationPreprocessor
+from .utils import cpu_needs_reduce_range
 
 
 if TYPE_CHECKING:
@@ -124,7 +127,9 @@ class ORTQuantizer(OptimumQuantizer):
                     - Or an `ORTModelForXX` class, e.g., `ORTModelForQuestionAnswering`.
             file_name(`Optional[str]`, *optional*):
                 Overwrites the default model file name from `"model.onnx"` to `file_name`.
-                This allows you to load different model files from the same repository or directory.
+                This allows you to load different model files from the same repository or directory. For an
+                `ORTModelForCausalLM` using separate decoders with and without past key/values, selects the decoder to
+                quantize, e.g. `"decoder_model.onnx"` or `"decoder_with_past_model.onnx"`.
         Returns:
             An instance of `ORTQuantizer`.
         """
@@ -140,7 +145,13 @@ class ORTQuantizer(OptimumQuantizer):
             if model_or_path.use_cache is False:
                 path = Path(model_or_path.decoder_model_path)
             elif model_or_path.use_cache is True and model_or_path.use_merged is False:
-                raise NotImplementedError(ort_quantizer_error_message)
+                decoder_paths = {
+                    path.name: path
+                    for path in (model_or_path.decoder_model_path, model_or_path.decoder_with_past_model_path)
+                }
+                if file_name not in decoder_paths:
+                    raise NotImplementedError(ort_quantizer_error_message)
+                path = decoder_paths[file_name]
             else:
                 path = Path(model_or_path.decoder_model_path)
         elif isinstance(model_or_path, Path) and file_name is None:
@@ -311,6 +322,36 @@ class ORTQuantizer(OptimumQuantizer):
         Returns:
             The path of the resulting quantized model.
         """
+        # The configuration may be reused by the caller for other models, the adjustments below are made on a copy.
+        # `dataclasses.replace` is not used as it validates the configuration again, invalid combinations being only
+        # reported by the warnings below
+        quantization_config = copy.copy(quantization_config)
+
+        if (
+            quantization_config.is_static
+            and quantization_config.format == QuantFormat.QOperator
+            and quantization_config.activations_dtype == QuantType.QInt8
+            and quantization_config.weights_dtype == QuantType.QInt8
+        ):
+            LOGGER.warning(
+                "ONNX Runtime static quantization with QuantType.QInt8 activations and weights should use the "
+                "QuantFormat.QDQ format, which will be used instead of QuantFormat.QOperator."
+            )
+            quantization_config.format = QuantFormat.QDQ
+
+        if (
+            not quantization_config.reduce_range
+            and quantization_config.activations_dtype == QuantType.QUInt8
+            and quantization_config.weights_dtype == QuantType.QInt8
+            and cpu_needs_reduce_range()
+        ):
+            # The model may be quantized for another target than the current host, hence the configuration is kept
+            LOGGER.warning(
+                "The current CPU supports AVX2 or AVX-512 but not VNNI, on which quantizing weights on 8 bits can "
+                "lead to saturation and to a significant accuracy drop. If the quantized model is meant to run on "
+                "such a CPU, please use reduce_range=True (e.g. with AutoQuantizationConfig.avx2)."
+            )
+
         use_qdq = quantization_config.is_static and quantization_config.format == QuantFormat.QDQ
         save_dir = Path(save_dir)
         save_dir.mkdir(parents=True, exist_ok=True)
@@ -342,80 +383,92 @@ class ORTQuantizer(OptimumQuantizer):
             quantization_config.nodes_to_exclude = list(nodes_to_exclude)
 
         has_subgraphs = False
-        onnx_model = onnx.load(Path(self.onnx_model_path).as_posix())
+        # The weights are not needed to look for subgraphs
+        onnx_model = onnx.load(Path(self.onnx_model_path).as_posix(), load_external_data=False)
         for node in onnx_model.graph.node:
             if node.op_type in ["If", "Loop", "Scan", "SequenceMap"]:
                 has_subgraphs = True
                 break
+        del onnx_model
 
         if quantization_config.is_static and has_subgraphs:
             raise NotImplementedError("Static quantization is currently not supported for models with" " subgraphs.")
 
-        quantizer_factory = QDQQuantizer if use_qdq else ONNXQuantizer
+        op_types_to_quantize = [
+            operator.value if isinstance(operator, ORTQuantizableOperator) else operator
+            for operator in quantization_config.operators_to_quantize
+        ]
+        extra_options = {
+            "WeightSymmetric": quantization_config.weights_symmetric,
+            "ActivationSymmetric": quantization_config.activations_symmetric,
+            # Subgraphs quantization is supported from ORT 1.13
+            "EnableSubgraph": has_subgraphs if parse(ort_version) >= Version("1.13.0") else False,
+            "ForceSymmetric": quantization_config.activations_symmetric and quantization_config.weights_symmetric,
+            "AddQDQPairToWeight": quantization_config.qdq_add_pair_to_weight,
+            "DedicatedQDQPair": quantization_config.qdq_dedicated_pair,
+            "QDQOpTypePerChannelSupportToAxis": quantization_config.qdq_op_type_per_channel_support_to_axis,
+        }
 
-        if parse(ort_version) >= Version("1.13.0"):
-            # The argument `input_qType` has been changed into `activation_qType` from ORT 1.13
-            quantizer = quantizer_factory(
-                model=onnx_model,
-                static=quantization_config.is_static,
+        suffix = f"_{file_suffix}" if file_suffix else ""
+        quantized_model_path = save_dir.joinpath(f"{self.onnx_model_path.stem}{suffix}").with_suffix(".onnx")
+
+        LOGGER.info("Quantizing model...")
+        # quantize_dynamic always quantizes the activations to QuantType.QUInt8, other activation types are handled
+        # by ONNXQuantizer
+        if not quantization_config.is_static and quantization_config.activations_dtype == QuantType.QUInt8:
+            # quantize_dynamic loads the model from its path, avoiding to hold an additional copy of it in memory
+            dynamic_quantization_kwargs = {}
+            if "optimize_model" in signature(quantize_dynamic).parameters:
+                # Do not apply ONNX Runtime graph optimizations on the quantized model, as with ONNXQuantizer
+                dynamic_quantization_kwargs["optimize_model"] = False
+
+            LOGGER.info(
+                f"Saving quantized model at: {save_dir} (external data format: " f"{use_external_data_format})"
+            )
+            quantize_dynamic(
+                Path(self.onnx_model_path).as_posix(),
+                quantized_model_path.as_posix(),
+                op_types_to_quantize=op_types_to_quantize,
                 per_channel=quantization_config.per_channel,
-                mode=quantization_config.mode,
-                weight_qType=quantization_config.weights_dtype,
-                activation_qType=quantization_config.activations_dtype,
-                tensors_range=calibration_tensors_range,
                 reduce_range=quantization_config.reduce_range,
+                weight_type=quantization_config.weights_dtype,
                 nodes_to_quantize=quantization_config.nodes_to_quantize,
                 nodes_to_exclude=quantization_config.nodes_to_exclude,
-                op_types_to_quantize=[
-                    operator.value if isinstance(operator, ORTQuantizableOperator) else operator
-                    for operator in quantization_config.operators_to_quantize
-                ],
-                extra_options={
-                    "WeightSymmetric": quantization_config.weights_symmetric,
-                    "ActivationSymmetric": quantization_config.activations_symmetric,
-                    "EnableSubgraph": has_subgraphs,
-                    "ForceSymmetric": quantization_config.activations_symmetric
-                    and quantization_config.weights_symmetric,
-                    "AddQDQPairToWeight": quantization_config.qdq_add_pair_to_weight,
-                    "DedicatedQDQPair": quantization_config.qdq_dedicated_pair,
-                    "QDQOpTypePerChannelSupportToAxis": quantization_config.qdq_op_type_per_channel_support_to_axis,
-                },
+                use_external_data_format=use_external_data_format,
+                # quantize_dynamic defaults to quantizing MatMul with a constant B only, contrary to ONNXQuantizer
+                extra_options={"MatMulConstBOnly": False, **extra_options},
+                **dynamic_quantization_kwargs,
             )
         else:
+            onnx_model = onnx.load(Path(self.onnx_model_path).as_posix())
+            quantizer_factory = QDQQuantizer if use_qdq else ONNXQuantizer
+
+            if parse(ort_version) >= Version("1.13.0"):
+                # The argument `input_qType` has been changed into `activation_qType` from ORT 1.13
+                activations_dtype_kwargs = {"activation_qType": quantization_config.activations_dtype}
+            else:
+                activations_dtype_kwargs = {"input_qType": quantization_config.activations_dtype}
+
             quantizer = quantizer_factory(
                 model=onnx_model,
                 static=quantization_config.is_static,
                 per_channel=quantization_config.per_channel,
                 mode=quantization_config.mode,
                 weight_qType=quantization_config.weights_dtype,
-                input_qType=quantization_config.activations_dtype,
                 tensors_range=calibration_tensors_range,
                 reduce_range=quantization_config.reduce_range,
                 nodes_to_quantize=quantization_config.nodes_to_quantize,
                 nodes_to_exclude=quantization_config.nodes_to_exclude,
-                op_types_to_quantize=[
-                    operator.value if isinstance(operator, ORTQuantizableOperator) else operator
-                    for operator in quantization_config.operators_to_quantize
-                ],
-                extra_options={
-                    "WeightSymmetric": quantization_config.weights_symmetric,
-                    "ActivationSymmetric": quantization_config.activations_symmetric,
-                    "EnableSubgraph": False,
-                    "ForceSymmetric": quantization_config.activations_symmetric
-                    and quantization_config.weights_symmetric,
-                    "AddQDQPairToWeight": quantization_config.qdq_add_pair_to_weight,
-                    "DedicatedQDQPair": quantization_config.qdq_dedicated_pair,
-                    "QDQOpTypePerChannelSupportToAxis": quantization_config.qdq_op_type_per_channel_support_to_axis,
-                },
+                op_types_to_quantize=op_types_to_quantize,
+                extra_options=extra_options,
+                **activations_dtype_kwargs,
             )
+            quantizer.quantize_model()
 
-        LOGGER.info("Quantizing model...")
-        quantizer.quantize_model()
-
-        suffix = f"_{file_suffix}" if file_suffix else ""
-        quantized_model_path = save_dir.joinpath(f"{self.onnx_model_path.stem}{suffix}").with_suffix(".onnx")
-        LOGGER.info(f"Saving quantized model at: {save_dir} (external data format: " f"{use_external_data_format})")
-        quantizer.model.save_model_to_file(quantized_model_path.as_posix(), use_external_data_format)
+            LOGGER.info(
+                f"Saving quantized model at: {save_dir} (external data format: " f"{use_external_data_format})"
+            )
+            quantizer.model.save_model_to_file(quantized_model_path.as_posix(), use_external_data_format)
 
         # Create and save the configuration summarizing all the parameters related to quantization
         ort_config = ORTConfig(quantization=quantization_config, use_external_data_format=use_external_data_format)
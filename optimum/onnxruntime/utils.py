@@ -13,12 +13,15 @@
 #  limitations under the License.
 """Utility functions, classes and constants for ONNX Runtime."""
 
+import functools
+import hashlib
 import importlib.util
 import os
 import re
 from enum import Enum
 from inspect import signature
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import torch
@@ -83,6 +86,38 @@ def is_cupy_available():
     return importlib.util.find_spec("cupy") is not None
 
 
+@functools.lru_cache()
+def get_cpu_flags() -> Set[str]:
+    """
+    Gets the instruction set extensions supported by the host CPU, read from `/proc/cpuinfo` or, when it is not
+    available, from `py-cpuinfo` if installed. Returns an empty set when the CPU capabilities can not be detected.
+    """
+    if os.path.isfile("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+
+    if importlib.util.find_spec("cpuinfo") is not None:
+        import cpuinfo
+
+        return set(cpuinfo.get_cpu_info().get("flags", []))
+
+    return set()
+
+
+def cpu_needs_reduce_range() -> bool:
+    """
+    Checks whether the host CPU supports AVX2 or AVX-512 without VNNI. On such CPUs, the u8s8 integer GEMM relies on
+    the VPMADDUBSW instruction, which can saturate with full range 8-bits weights, hence 7-bits weights should be used.
+    """
+    flags = get_cpu_flags()
+    has_avx = "avx2" in flags or "avx512f" in flags
+    # py-cpuinfo may report the flags without underscores
+    has_vnni = len(flags & {"avx512_vnni", "avx512vnni", "avx_vnni", "avxvnni"}) > 0
+    return has_avx and not has_vnni
+
+
 class ORTConfigManager:
     """
     A class that contains all the information needed by ONNX Runtime optimization for a given model type.
@@ -161,15 +196,15 @@ def wrap_onnx_config_for_loss(onnx_config: OnnxConfig) -> OnnxConfig:
     return OnnxConfigWithLoss(onnx_config)
 
 
-def get_device_for_provider(provider: str) -> torch.device:
+def get_device_for_provider(provider: str, provider_options: Optional[Dict[str, Any]] = None) -> torch.device:
     """
-    Gets the PyTorch device (CPU/CUDA) associated with an ONNX Runtime provider.
+    Gets the PyTorch device (CPU/CUDA) associated with an ONNX Runtime provider, on the GPU set by the `device_id`
+    provider option if any.
     """
-    return (
-        torch.device("cuda:0")
-        if provider in ["CUDAExecutionProvider", "TensorrtExecutionProvider"]
-        else torch.device("cpu")
-    )
+    if provider in ["CUDAExecutionProvider", "TensorrtExecutionProvider"]:
+        device_id = int((provider_options or {}).get("device_id", 0))
+        return torch.device(f"cuda:{device_id}")
+    return torch.device("cpu")
 
 
 def get_provider_for_device(device: torch.device) -> str:
@@ -241,6 +276,12 @@ def validate_provider_availability(provider: str):
 
     available_providers = ort.get_available_providers()
     if provider not in available_providers:
+        # Provider names are case sensitive, e.g. `TensorRTExecutionProvider` is not a valid name
+        matching_providers = [name for name in ort.get_all_providers() if name.lower() == provider.lower()]
+        if len(matching_providers) > 0:
+            raise ValueError(
+                f"Asked to use {provider} as an ONNX Runtime execution provider, did you mean {matching_providers[0]}?"
+            )
         raise ValueError(
             f"Asked to use {provider} as an ONNX Runtime execution provider, but the available execution providers are {available_providers}."
         )
@@ -248,20 +289,53 @@ def validate_provider_availability(provider: str):
 
 def check_io_binding(providers: List[str], use_io_binding: Optional[bool] = None) -> bool:
     """
-    Whether to use IOBinding or not.
+    Whether to use IOBinding or not. IOBinding is enabled by default for CUDAExecutionProvider, and can be explicitly
+    enabled for CPUExecutionProvider to have ONNX Runtime read the inputs from, and write the outputs to, torch tensors
+    without intermediate copies.
     """
-    if use_io_binding is None and providers[0] == "CUDAExecutionProvider":
-        use_io_binding = True
-    elif providers[0] != "CUDAExecutionProvider":
+    if use_io_binding is None:
+        use_io_binding = providers[0] == "CUDAExecutionProvider"
+    elif providers[0] not in ["CUDAExecutionProvider", "CPUExecutionProvider"]:
         if use_io_binding is True:
             logger.warning(
-                "No need to enable IO Binding if the provider used is not CUDAExecutionProvider. IO Binding will be turned off."
+                "IO Binding is only supported with CUDAExecutionProvider and CPUExecutionProvider. IO Binding will be turned off."
             )
         use_io_binding = False
 
     return use_io_binding
 
 
+def get_optimized_model_cache_path(
+    model_path: Union[str, Path],
+    provider: str,
+    cache_dir: Union[str, Path],
+    graph_optimization_level: ort.GraphOptimizationLevel = ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+) -> Path:
+    """
+    Gets the path under which the graph optimized by ONNX Runtime for a given model and provider is serialized.
+
+    The file name is keyed by the resolved path, size and modification time of the ONNX file, the execution provider,
+    the graph optimization level and the ONNX Runtime version, so that a stale optimized graph is never reused without
+    having to read the model.
+
+    Args:
+        model_path (`Union[str, Path]`):
+            Path of the ONNX model.
+        provider (`str`):
+            The ONNX Runtime execution provider the model is loaded with.
+        cache_dir (`Union[str, Path]`):
+            The directory where the optimized graph is stored.
+        graph_optimization_level (`onnxruntime.GraphOptimizationLevel`, defaults to `ORT_ENABLE_ALL`):
+            The graph optimization level applied by ONNX Runtime.
+    """
+    model_stat = os.stat(model_path)
+    sha1 = hashlib.sha1(
+        f"{os.path.realpath(model_path)}-{model_stat.st_size}-{model_stat.st_mtime_ns}-{provider}-"
+        f"{int(graph_optimization_level)}-{ort.__version__}".encode()
+    )
+    return Path(cache_dir) / f"opt_{sha1.hexdigest()}.onnx"
+
+
 def get_ordered_input_names(input_names: List[str], func: Callable) -> List[str]:
     """
     Returns the input names from input_names keys ordered according to the signature of func. This is especially useful with the
@@ -14,13 +14,40 @@
 # limitations under the License.
 """Utility functions related to both local files and files on the Hugging Face Hub."""
 
+import os
 import re
+import shutil
 from pathlib import Path
 from typing import List, Optional, Union
 
 from huggingface_hub import HfApi, HfFolder, get_hf_file_metadata, hf_hub_url
 
 
+def copy_file(src_path: Union[str, Path], dst_path: Union[str, Path]):
+    """
+    Copies the file `src_path` to `dst_path`. When available (Linux), `os.copy_file_range` is used so that the copy is
+    done by the kernel, and is a constant-time reflink on copy-on-write file systems (e.g. Btrfs, XFS). Otherwise, or
+    if it fails, `shutil.copyfile` is used.
+    """
+    copy_done = False
+    # Opening the destination would truncate the source if they are the same file, shutil raises in this case
+    if hasattr(os, "copy_file_range") and not (os.path.exists(dst_path) and os.path.samefile(src_path, dst_path)):
+        try:
+            with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            copy_done = remaining == 0
+        except OSError:
+            pass
+
+    if not copy_done:
+        shutil.copyfile(src_path, dst_path)
+
+
 def validate_file_exists(
     model_name_or_path: Union[str, Path], filename: str, subfolder: str = "", revision: Optional[str] = None
 ) -> bool:
@@ -43,7 +43,9 @@ def maybe_load_preprocessors(src_name_or_path: Union[str, Path], subfolder: str
     return preprocessors
 
 
-def maybe_save_preprocessors(src_name_or_path: Union[str, Path], dest_dir: Union[str, Path], src_subfolder: str = ""):
+def maybe_save_preprocessors(
+    src_name_or_path: Union[str, Path], dest_dir: Union[str, Path], src_subfolder: str = ""
+) -> List:
     """
     Saves the tokenizer, the processor and the feature extractor when found in `src_dir` in `dest_dir`.
 
@@ -55,10 +57,15 @@ def maybe_save_preprocessors(src_name_or_path: Union[str, Path], dest_dir: Union
         src_subfolder (`str`, defaults to `""`):
             In case the preprocessor files are located inside a subfolder of the model directory / repo on the Hugging
             Face Hub, you can specify the subfolder name here.
+
+    Returns:
+        `List`: The preprocessors that were loaded from `src_name_or_path` and saved in `dest_dir`.
     """
     if not isinstance(dest_dir, Path):
         dest_dir = Path(dest_dir)
 
     dest_dir.mkdir(exist_ok=True)
-    for preprocessor in maybe_load_preprocessors(src_name_or_path, subfolder=src_subfolder):
+    preprocessors = maybe_load_preprocessors(src_name_or_path, subfolder=src_subfolder)
+    for preprocessor in preprocessors:
         preprocessor.save_pretrained(dest_dir)
+    return preprocessors
@@ -21,6 +21,7 @@ import time
 import unittest
 from pathlib import Path
 from typing import Dict
+from unittest import mock
 
 import numpy as np
 import onnx
@@ -29,6 +30,7 @@ import pytest
 import requests
 import torch
 from huggingface_hub.constants import default_cache_path
+from onnx import TensorProto, helper, numpy_helper
 from parameterized import parameterized
 from PIL import Image
 from transformers import (
@@ -52,8 +54,12 @@ from transformers import (
     AutoModelForTokenClassification,
     AutoModelForVision2Seq,
     AutoTokenizer,
+    GPT2Config,
+    GPT2LMHeadModel,
     MBartForConditionalGeneration,
     PretrainedConfig,
+    T5Config,
+    T5ForConditionalGeneration,
     set_seed,
 )
 from transformers.modeling_utils import no_init_weights
@@ -87,11 +93,15 @@ from optimum.onnxruntime import (
     ORTModelForSpeechSeq2Seq,
     ORTModelForTokenClassification,
     ORTModelForVision2Seq,
+    ORTOptimizer,
     ORTStableDiffusionPipeline,
 )
 from optimum.onnxruntime.base import ORTDecoder, ORTDecoderForSeq2Seq, ORTEncoder
+from optimum.onnxruntime.configuration import OptimizationConfig
+from optimum.onnxruntime.io_binding import IOBindingHelper
 from optimum.onnxruntime.modeling_diffusion import ORTModelTextEncoder, ORTModelUnet, ORTModelVaeDecoder
 from optimum.onnxruntime.modeling_ort import ORTModel
+from optimum.onnxruntime.utils import get_optimized_model_cache_path
 from optimum.pipelines import pipeline
 from optimum.utils import (
     CONFIG_NAME,
@@ -224,6 +234,93 @@ class ORTModelIntegrationTest(unittest.TestCase):
         self.assertIsInstance(model.model, onnxruntime.capi.onnxruntime_inference_collection.InferenceSession)
         self.assertIsInstance(model.config, PretrainedConfig)
 
+    @staticmethod
+    def _make_hub_cache_snapshot(cache_dir: str, repo_id: str) -> Path:
+        # layout of a Hub cache holding a single revision of the repository
+        repo_dir = Path(cache_dir, "models--" + repo_id.replace("/", "--"))
+        snapshot_dir = repo_dir / "snapshots" / "0123456789abcdef"
+        snapshot_dir.mkdir(parents=True)
+        (repo_dir / "refs").mkdir()
+        (repo_dir / "refs" / "main").write_text(snapshot_dir.name)
+        return snapshot_dir
+
+    def test_load_model_from_cache_with_onnx_file_lookup(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            snapshot_dir = self._make_hub_cache_snapshot(tmpdirname, "optimum/local-model")
+            shutil.copy(os.path.join(self.LOCAL_MODEL_PATH, "config.json"), snapshot_dir)
+            shutil.copy(os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME), snapshot_dir / "model_quantized.onnx")
+
+            model = ORTModelForSequenceClassification.from_pretrained(
+                "optimum/local-model", cache_dir=tmpdirname, local_files_only=True
+            )
+            self.assertEqual(model.model_path.name, "model_quantized.onnx")
+
+            with self.assertRaises(FileNotFoundError) as context:
+                ORTModel._from_pretrained(
+                    "optimum/missing-model", model.config, cache_dir=tmpdirname, local_files_only=True
+                )
+            self.assertIn("file_name", str(context.exception))
+
+    # Randomly initialized models exported locally, the Hub being not needed to get them
+    TINY_GENERATION_MODELS = [
+        (
+            ORTModelForCausalLM,
+            GPT2LMHeadModel,
+            GPT2Config(n_layer=1, n_head=2, n_embd=8, vocab_size=64, n_positions=32, eos_token_id=0),
+            "text-generation-with-past",
+        ),
+        (
+            ORTModelForSeq2SeqLM,
+            T5ForConditionalGeneration,
+            T5Config(vocab_size=64, d_model=8, d_kv=4, d_ff=16, num_layers=1, num_heads=2, decoder_start_token_id=0),
+            "text2text-generation-with-past",
+        ),
+    ]
+
+    @staticmethod
+    def _export_tiny_model(pytorch_model_cls, config, task, tmpdirname: str) -> str:
+        pytorch_model_cls(config).save_pretrained(os.path.join(tmpdirname, "pytorch"))
+        main_export(
+            os.path.join(tmpdirname, "pytorch"),
+            output=os.path.join(tmpdirname, "onnx"),
+            task=task,
+            no_post_process=True,
+            do_validation=False,
+        )
+        return os.path.join(tmpdirname, "onnx")
+
+    @parameterized.expand(TINY_GENERATION_MODELS)
+    def test_load_decoder_model_from_cache_with_onnx_file_lookup(self, model_cls, pytorch_model_cls, config, task):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            self._export_tiny_model(pytorch_model_cls, config, task, tmpdirname)
+            cache_dir = os.path.join(tmpdirname, "cache")
+            snapshot_dir = self._make_hub_cache_snapshot(cache_dir, "optimum/local-model")
+            for file_name in os.listdir(os.path.join(tmpdirname, "onnx")):
+                shutil.copy(os.path.join(tmpdirname, "onnx", file_name), snapshot_dir)
+
+            model = model_cls.from_pretrained("optimum/local-model", cache_dir=cache_dir, local_files_only=True)
+            self.assertTrue(model.use_cache)
+            self.assertTrue(all(path.parent == snapshot_dir for path in model.onnx_paths))
+            outputs = model.generate(torch.ones((1, 3), dtype=torch.int64), max_new_tokens=2, min_new_tokens=2)
+            self.assertEqual(outputs.shape[0], 1)
+
+            with self.assertRaises(FileNotFoundError):
+                model_cls._from_pretrained(
+                    "optimum/missing-model", model.config, cache_dir=cache_dir, local_files_only=True
+                )
+
+    @parameterized.expand(TINY_GENERATION_MODELS)
+    def test_decoder_model_rejects_cuda_graph(self, model_cls, pytorch_model_cls, config, task):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            onnx_dir = self._export_tiny_model(pytorch_model_cls, config, task, tmpdirname)
+            self.assertIsInstance(model_cls.from_pretrained(onnx_dir), model_cls)
+
+            # the CPU execution provider does not capture CUDA graphs, the provider option is mocked
+            with mock.patch.object(ORTModel, "_is_cuda_graph_enabled", return_value=True):
+                with self.assertRaises(ValueError) as context:
+                    model_cls.from_pretrained(onnx_dir)
+            self.assertIn("enable_cuda_graph", str(context.exception))
+
     def test_load_model_from_empty_cache(self):
         dirpath = os.path.join(default_cache_path, "models--" + self.TINY_ONNX_MODEL_ID.replace("/", "--"))
 
@@ -464,6 +561,397 @@ class ORTModelIntegrationTest(unittest.TestCase):
         model = ORTModel.from_pretrained(self.ONNX_MODEL_ID, session_options=options)
         self.assertEqual(model.model.get_session_options().intra_op_num_threads, 3)
 
+    def test_load_model_with_optimized_model_cache(self):
+        model_path = os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME)
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 3
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            session = ORTModel.load_model(model_path, session_options=options, optimized_model_cache_dir=tmpdirname)
+            cached_files = os.listdir(tmpdirname)
+            self.assertEqual(len(cached_files), 1)
+            self.assertEqual(session._model_path, model_path)
+
+            cached_session = ORTModel.load_model(
+                model_path, session_options=options, optimized_model_cache_dir=tmpdirname
+            )
+            self.assertListEqual(os.listdir(tmpdirname), cached_files)
+            self.assertEqual(cached_session._model_path, model_path)
+            self.assertEqual(cached_session.get_session_options().intra_op_num_threads, 3)
+
+            # the session options passed by the user are left untouched
+            self.assertEqual(options.optimized_model_filepath, "")
+            self.assertEqual(options.graph_optimization_level, onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL)
+
+            inputs = {
+                inp.name: np.ones([dim if isinstance(dim, int) else 2 for dim in inp.shape], dtype=np.int64)
+                for inp in session.get_inputs()
+            }
+            outputs = session.run(None, inputs)
+            cached_outputs = cached_session.run(None, inputs)
+            for output, cached_output in zip(outputs, cached_outputs):
+                self.assertTrue(np.allclose(output, cached_output, atol=1e-4))
+
+    def test_from_pretrained_with_optimized_model_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            model = ORTModelForSequenceClassification.from_pretrained(
+                self.LOCAL_MODEL_PATH, optimized_model_cache_dir=tmpdirname
+            )
+            self.assertEqual(len(os.listdir(tmpdirname)), 1)
+            self.assertEqual(model.model_path, Path(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME))
+
+    def test_optimized_model_cache_path_follows_model_file(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            model_path = shutil.copy(os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME), tmpdirname)
+            cache_path = get_optimized_model_cache_path(model_path, "CPUExecutionProvider", tmpdirname)
+            self.assertEqual(
+                get_optimized_model_cache_path(model_path, "CPUExecutionProvider", tmpdirname), cache_path
+            )
+            self.assertNotEqual(
+                get_optimized_model_cache_path(model_path, "CUDAExecutionProvider", tmpdirname), cache_path
+            )
+
+            # a model overwritten in place gets a new optimized graph
+            model_stat = os.stat(model_path)
+            os.utime(model_path, ns=(model_stat.st_atime_ns, model_stat.st_mtime_ns + 1_000_000_000))
+            self.assertNotEqual(
+                get_optimized_model_cache_path(model_path, "CPUExecutionProvider", tmpdirname), cache_path
+            )
+
+    def test_load_model_with_optimized_model_cache_and_external_data(self):
+        with tempfile.TemporaryDirectory() as model_dir, tempfile.TemporaryDirectory() as cache_dir:
+            model_path = shutil.copy(os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME), model_dir)
+            Path(model_path + "_data").touch()
+            ORTModel.load_model(model_path, optimized_model_cache_dir=cache_dir)
+            self.assertListEqual(os.listdir(cache_dir), [])
+
+    @require_torch_gpu
+    @pytest.mark.gpu_test
+    def test_tensorrt_engine_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            model = ORTModel.from_pretrained(
+                self.ONNX_MODEL_ID, provider="TensorrtExecutionProvider", optimized_model_cache_dir=tmpdirname
+            )
+            provider_options = model.model.get_provider_options()["TensorrtExecutionProvider"]
+            self.assertEqual(provider_options["trt_engine_cache_enable"], "1")
+            self.assertEqual(provider_options["trt_engine_cache_path"], os.path.join(tmpdirname, "tensorrt"))
+
+    def test_load_model_with_dynamic_shapes(self):
+        model_path = os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME)
+        self.assertTrue(ORTModel.load_model(model_path).get_session_options().enable_mem_pattern)
+        session = ORTModel.load_model(model_path, dynamic_shapes=True)
+        self.assertFalse(session.get_session_options().enable_mem_pattern)
+
+    def test_load_model_with_threads_from_env(self):
+        model_path = os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME)
+        with mock.patch.dict(os.environ, {"ORT_INTRA_OP_THREADS": "2", "ORT_INTER_OP_THREADS": "3"}):
+            session = ORTModel.load_model(model_path)
+            session_options = session.get_session_options()
+            self.assertEqual(session_options.intra_op_num_threads, 2)
+            self.assertEqual(session_options.inter_op_num_threads, 3)
+            self.assertEqual(session_options.execution_mode, onnxruntime.ExecutionMode.ORT_PARALLEL)
+
+            # the session options passed by the user take precedence
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = 1
+            session = ORTModel.load_model(model_path, session_options=options)
+            self.assertEqual(session.get_session_options().intra_op_num_threads, 1)
+            self.assertEqual(session.get_session_options().execution_mode, onnxruntime.ExecutionMode.ORT_SEQUENTIAL)
+
+    def test_load_model_without_cpu_mem_arena_from_env(self):
+        model_path = os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME)
+        self.assertTrue(ORTModel.load_model(model_path).get_session_options().enable_cpu_mem_arena)
+        with mock.patch.dict(os.environ, {"ORT_DISABLE_CPU_MEM_ARENA": "1"}):
+            session = ORTModel.load_model(model_path)
+            self.assertFalse(session.get_session_options().enable_cpu_mem_arena)
+
+    def test_load_model_with_session_cache(self):
+        model_path = os.path.join(self.LOCAL_MODEL_PATH, ONNX_WEIGHTS_NAME)
+        session = ORTModel.load_model(model_path, use_session_cache=True)
+        self.assertIs(ORTModel.load_model(model_path, use_session_cache=True), session)
+        self.assertIsNot(ORTModel.load_model(model_path), session)
+        self.assertIsNot(
+            ORTModel.load_model(model_path, session_options=onnxruntime.SessionOptions(), use_session_cache=True),
+            session,
+        )
+
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_session_cache=True)
+        other_model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_session_cache=True)
+        self.assertIs(model.model, session)
+        self.assertIs(other_model.model, session)
+
+        # moving a model does not affect the models sharing its session
+        model.to("cpu")
+        self.assertIsNot(model.model, session)
+        self.assertIs(other_model.model, session)
+
+    def test_load_pre_optimized_model(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            optimizer = ORTOptimizer.from_pretrained(self.LOCAL_MODEL_PATH)
+            optimizer.optimize(OptimizationConfig(optimization_level=99), tmpdirname)
+            model = ORTModelForSequenceClassification.from_pretrained(tmpdirname, file_name="model_optimized.onnx")
+            self.assertEqual(
+                model.model.get_session_options().graph_optimization_level,
+                onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            )
+
+            optimizer.optimize(OptimizationConfig(optimization_level=2), tmpdirname)
+            model = ORTModelForSequenceClassification.from_pretrained(tmpdirname, file_name="model_optimized.onnx")
+            self.assertEqual(
+                model.model.get_session_options().graph_optimization_level,
+                onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+            )
+
+    def test_io_binding_on_cpu(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH)
+        self.assertFalse(model.use_io_binding)
+        io_model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        self.assertTrue(io_model.use_io_binding)
+
+        input_ids = torch.ones((2, 8), dtype=torch.int64)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+        io_outputs = io_model(input_ids=input_ids, attention_mask=attention_mask)
+        self.assertIsInstance(io_outputs.logits, torch.Tensor)
+        self.assertTrue(torch.allclose(outputs.logits, io_outputs.logits, atol=1e-4))
+
+        # IO Binding is opt-in on CPU, an explicit choice is kept when moving the model
+        model.to("cpu")
+        self.assertFalse(model.use_io_binding)
+        io_model.to("cpu")
+        self.assertTrue(io_model.use_io_binding)
+        io_outputs = io_model(input_ids=input_ids, attention_mask=attention_mask)
+        self.assertTrue(torch.allclose(outputs.logits, io_outputs.logits, atol=1e-4))
+
+    def test_reuse_output_buffers(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        model.reuse_output_buffers = True
+
+        input_ids = torch.ones((2, 8), dtype=torch.int64)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        logits = model(input_ids=input_ids, attention_mask=attention_mask).logits.clone()
+        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+        self.assertTrue(torch.allclose(logits, outputs.logits))
+        self.assertEqual(
+            outputs.logits.data_ptr(),
+            model(input_ids=input_ids, attention_mask=attention_mask).logits.data_ptr(),
+        )
+
+        # a new buffer is allocated when the output shape changes
+        input_ids = torch.ones((3, 8), dtype=torch.int64)
+        attention_mask = torch.ones((3, 8), dtype=torch.int64)
+        self.assertEqual(model(input_ids=input_ids, attention_mask=attention_mask).logits.shape, (3, 2))
+
+    def test_io_binding_cache(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH)
+        io_model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        io_model.io_binding_cache_size = 1
+
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        for input_ids in [torch.ones((2, 8), dtype=torch.int64), torch.randint(0, 100, (2, 8))]:
+            logits = model(input_ids=input_ids, attention_mask=attention_mask).logits
+            io_logits = io_model(input_ids=input_ids, attention_mask=attention_mask).logits
+            self.assertTrue(torch.allclose(logits, io_logits, atol=1e-4))
+        self.assertEqual(len(io_model._io_bindings_cache), 1)
+
+        # the least recently used shape is evicted
+        input_ids = torch.ones((3, 8), dtype=torch.int64)
+        attention_mask = torch.ones((3, 8), dtype=torch.int64)
+        self.assertEqual(io_model(input_ids=input_ids, attention_mask=attention_mask).logits.shape, (3, 2))
+        self.assertEqual(len(io_model._io_bindings_cache), 1)
+
+    @parameterized.expand([ORTModelForCustomTasks, ORTModelForSemanticSegmentation])
+    def test_io_binding_helper_on_cpu(self, model_cls):
+        model = model_cls.from_pretrained(self.LOCAL_MODEL_PATH)
+        io_model = model_cls.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        self.assertTrue(io_model.use_io_binding)
+
+        input_ids = torch.randint(0, 100, (2, 8))
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        logits = model(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+        io_logits = io_model(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+        self.assertEqual(io_logits.device, torch.device("cpu"))
+        self.assertTrue(torch.allclose(logits, io_logits, atol=1e-4))
+
+    @parameterized.expand([ORTModelForCustomTasks, ORTModelForSemanticSegmentation])
+    def test_io_binding_helper_with_non_contiguous_inputs(self, model_cls):
+        model = model_cls.from_pretrained(self.LOCAL_MODEL_PATH)
+        io_model = model_cls.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+
+        # transposed and sliced inputs, whose contiguous copies are the ones bound to the session
+        input_ids = torch.randint(0, 100, (8, 2)).T
+        attention_mask = torch.ones((2, 16), dtype=torch.int64)[:, ::2]
+        self.assertFalse(input_ids.is_contiguous())
+        self.assertFalse(attention_mask.is_contiguous())
+
+        io_binding = IOBindingHelper.prepare_io_binding(io_model, input_ids=input_ids, attention_mask=attention_mask)
+        self.assertEqual(len(io_binding._bound_tensors), 2)
+        self.assertTrue(all(tensor.is_contiguous() for tensor in io_binding._bound_tensors))
+        gc.collect()
+        io_model.model.run_with_iobinding(io_binding)
+
+        logits = model(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+        io_logits = IOBindingHelper.to_pytorch(io_binding.get_outputs()[0])
+        self.assertTrue(torch.allclose(logits, io_logits, atol=1e-4))
+        io_logits = io_model(input_ids=input_ids, attention_mask=attention_mask)["logits"]
+        self.assertTrue(torch.allclose(logits, io_logits, atol=1e-4))
+
+    def test_io_binding_cache_with_cuda_graph(self):
+        io_model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        # the CPU execution provider does not capture CUDA graphs, only the binding constraints are checked here
+        io_model._use_cuda_graph = True
+
+        input_ids = torch.ones((2, 8), dtype=torch.int64)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        for _ in range(2):
+            self.assertEqual(io_model(input_ids=input_ids, attention_mask=attention_mask).logits.shape, (2, 2))
+        self.assertEqual(len(io_model._io_bindings_cache), 1)
+
+        input_ids = torch.ones((3, 8), dtype=torch.int64)
+        attention_mask = torch.ones((3, 8), dtype=torch.int64)
+        with self.assertRaises(ValueError) as context:
+            io_model(input_ids=input_ids, attention_mask=attention_mask)
+        self.assertIn("Please pad the inputs to fixed shapes", str(context.exception))
+
+    @require_torch_gpu
+    @pytest.mark.gpu_test
+    def test_cuda_graph(self):
+        model = ORTModelForSequenceClassification.from_pretrained(
+            self.LOCAL_MODEL_PATH, provider="CUDAExecutionProvider", provider_options={"enable_cuda_graph": True}
+        )
+        self.assertTrue(model._use_cuda_graph)
+        self.assertEqual(model.io_binding_cache_size, 1)
+
+        with self.assertRaises(ValueError):
+            ORTModelForSequenceClassification.from_pretrained(
+                self.LOCAL_MODEL_PATH,
+                provider="CUDAExecutionProvider",
+                provider_options={"enable_cuda_graph": True},
+                use_io_binding=False,
+            )
+
+    @require_torch_gpu
+    @pytest.mark.gpu_test
+    def test_user_compute_stream(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH)
+        stream = torch.cuda.Stream()
+        io_model = ORTModelForSequenceClassification.from_pretrained(
+            self.LOCAL_MODEL_PATH,
+            provider="CUDAExecutionProvider",
+            provider_options={"user_compute_stream": str(stream.cuda_stream)},
+        )
+        self.assertTrue(io_model.use_io_binding)
+
+        # the CPU inputs are copied on the PyTorch current stream, which the ONNX Runtime stream waits for
+        input_ids = torch.randint(0, 100, (2, 8))
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        logits = model(input_ids=input_ids, attention_mask=attention_mask).logits
+        io_logits = io_model(input_ids=input_ids, attention_mask=attention_mask).logits
+        self.assertTrue(torch.allclose(logits, io_logits.cpu(), atol=1e-4))
+
+    def test_io_metadata_cached_per_session(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH, use_io_binding=True)
+        io_metadata = model._get_io_metadata(model.model)
+        self.assertEqual([node.name for node in io_metadata.inputs], list(model.inputs_names))
+        self.assertEqual([node.name for node in io_metadata.outputs], list(model.output_names))
+        self.assertEqual(io_metadata.output_names, list(model.output_names))
+        self.assertEqual(io_metadata.name_to_np_type["logits"], np.float32)
+        self.assertEqual(io_metadata.name_to_ort_type["logits"], "tensor(float)")
+        self.assertIs(model._get_io_metadata(model.model), io_metadata)
+
+        input_ids = torch.ones((2, 8), dtype=torch.int64)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        self.assertEqual(model(input_ids=input_ids, attention_mask=attention_mask).logits.shape, (2, 2))
+
+    def test_run_inference_torch_outputs(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH)
+        onnx_inputs = {
+            "input_ids": np.ones((2, 8), dtype=np.int64),
+            "attention_mask": np.ones((2, 8), dtype=np.int64),
+        }
+        outputs = model._run_inference(onnx_inputs, use_torch=False)
+        torch_outputs = model._run_inference(onnx_inputs, use_torch=True)
+        self.assertIsInstance(outputs[0], np.ndarray)
+        self.assertIsInstance(torch_outputs[0], torch.Tensor)
+        np.testing.assert_allclose(torch_outputs[0].numpy(), outputs[0], atol=1e-6)
+
+    def test_run_inference_torch_outputs_via_dlpack(self):
+        input_ids = helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch_size", "sequence_length"])
+        logits = helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch_size", "sequence_length"])
+        mask = helper.make_tensor_value_info("mask", TensorProto.BOOL, ["batch_size", "sequence_length"])
+        zero = numpy_helper.from_array(np.array(0, dtype=np.int64), name="zero")
+        graph = helper.make_graph(
+            [
+                helper.make_node("Cast", ["input_ids"], ["logits"], to=TensorProto.FLOAT),
+                helper.make_node("Greater", ["input_ids", "zero"], ["mask"]),
+            ],
+            "dlpack",
+            [input_ids],
+            [logits, mask],
+            initializer=[zero],
+        )
+        onnx_model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+
+        dlpack_outputs = []
+
+        def to_dlpack(ort_value):
+            dlpack_outputs.append(ort_value.data_type())
+            return torch.utils.dlpack.to_dlpack(torch.from_numpy(ort_value.numpy()))
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            onnx.save(onnx_model, os.path.join(tmpdirname, ONNX_WEIGHTS_NAME))
+            shutil.copy(os.path.join(self.LOCAL_MODEL_PATH, "config.json"), tmpdirname)
+            model = ORTModel.from_pretrained(tmpdirname)
+
+            onnx_inputs = {"input_ids": np.array([[0, 1, 2], [3, 0, 4]], dtype=np.int64)}
+            with mock.patch("optimum.onnxruntime.modeling_ort._ORT_VALUE_SUPPORTS_DLPACK", True), mock.patch.object(
+                onnxruntime.OrtValue, "to_dlpack", to_dlpack, create=True
+            ):
+                torch_logits, torch_mask = model._run_inference(onnx_inputs, use_torch=True)
+
+        # the boolean output, not supported by DLPack, is converted through NumPy
+        self.assertListEqual(dlpack_outputs, ["tensor(float)"])
+        self.assertEqual(torch_logits.dtype, torch.float32)
+        self.assertTrue(torch.equal(torch_logits, torch.from_numpy(onnx_inputs["input_ids"]).float()))
+        self.assertEqual(torch_mask.dtype, torch.bool)
+        self.assertTrue(torch.equal(torch_mask, torch.from_numpy(onnx_inputs["input_ids"] > 0)))
+
+    def test_tensors_to_numpy(self):
+        input_ids = torch.arange(16, dtype=torch.int64).view(2, 8)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        arrays = ORTModel._tensors_to_numpy(input_ids, attention_mask, None)
+        self.assertEqual(len(arrays), 3)
+        self.assertIsNone(arrays[2])
+        np.testing.assert_array_equal(arrays[0], input_ids.numpy())
+        np.testing.assert_array_equal(arrays[1], attention_mask.numpy())
+        self.assertTrue(np.shares_memory(arrays[0], input_ids.numpy()))
+
+        embeddings = torch.ones((2, 8), requires_grad=True)
+        np.testing.assert_array_equal(ORTModel._tensors_to_numpy(embeddings)[0], np.ones((2, 8), dtype=np.float32))
+
+    @require_torch_gpu
+    def test_tensors_to_numpy_single_copy(self):
+        input_ids = torch.arange(16, dtype=torch.int64, device="cuda").view(2, 8)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64, device="cuda")
+        input_ids_array, attention_mask_array = ORTModel._tensors_to_numpy(input_ids, attention_mask)
+        self.assertTrue(input_ids_array.flags["C_CONTIGUOUS"])
+        np.testing.assert_array_equal(input_ids_array, input_ids.cpu().numpy())
+        np.testing.assert_array_equal(attention_mask_array, attention_mask.cpu().numpy())
+
+    def test_unused_token_type_ids(self):
+        model = ORTModelForSequenceClassification.from_pretrained(self.LOCAL_MODEL_PATH)
+        self.assertNotIn("token_type_ids", model.inputs_names)
+
+        input_ids = torch.ones((2, 8), dtype=torch.int64)
+        attention_mask = torch.ones((2, 8), dtype=torch.int64)
+        token_type_ids = torch.zeros((2, 8), dtype=torch.int64)
+        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+        for use_io_binding in [False, True]:
+            model.use_io_binding = use_io_binding
+            outputs_with_token_type_ids = model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            )
+            self.assertTrue(torch.allclose(outputs.logits, outputs_with_token_type_ids.logits, atol=1e-4))
+
     def test_passing_session_options_seq2seq(self):
         options = onnxruntime.SessionOptions()
         options.intra_op_num_threads = 3
@@ -2039,6 +2527,52 @@ class ORTModelForCausalLMIntegrationTest(ORTModelTestMixin):
 
         gc.collect()
 
+    def test_merged_decoder_fp16(self):
+        from onnxruntime.transformers.float16 import convert_float_to_float16
+
+        model_args = {"test_name": "gpt2_merged", "model_arch": "gpt2", "use_cache": True, "use_merged": True}
+        self._setup(model_args)
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            model = ORTModelForCausalLM.from_pretrained(self.onnx_model_dirs["gpt2_merged"], use_merged=True)
+            model.save_pretrained(tmpdirname)
+            model_path = Path(tmpdirname, ONNX_DECODER_MERGED_NAME)
+            onnx.save(
+                convert_float_to_float16(onnx.load(model_path), keep_io_types=False, disable_shape_infer=True),
+                model_path,
+            )
+
+            fp16_model = ORTModelForCausalLM.from_pretrained(tmpdirname, use_merged=True)
+            self.assertTrue(fp16_model.decoder.use_fp16)
+
+            # the dummy past key/values of the first step match the float16 inputs of the merged decoder
+            input_ids = torch.ones((1, 4), dtype=torch.int64)
+            outputs = fp16_model(input_ids=input_ids, attention_mask=torch.ones_like(input_ids))
+            self.assertEqual(outputs.logits.dtype, torch.float16)
+
+        gc.collect()
+
+    @parameterized.expand(grid_parameters({"model_arch": ["gpt2"], "use_cache": [True]}))
+    def test_default_attention_mask(self, test_name: str, model_arch: str, use_cache: bool):
+        model_args = {"test_name": test_name, "model_arch": model_arch, "use_cache": use_cache}
+        self._setup(model_args)
+
+        model = ORTModelForCausalLM.from_pretrained(self.onnx_model_dirs[test_name], use_cache=use_cache)
+        tokenizer = get_preprocessor(MODEL_NAMES[model_arch])
+        tokens = tokenizer("This is a sample output", return_tensors="pt")
+
+        outputs = model(**tokens)
+        outputs_without_mask = model(input_ids=tokens["input_ids"])
+        self.assertTrue(torch.allclose(outputs.logits, outputs_without_mask.logits, atol=1e-4))
+
+        input_ids = torch.cat([tokens["input_ids"], tokens["input_ids"][:, -1:]], dim=-1)
+        attention_mask = torch.ones_like(input_ids)
+        outputs = model(input_ids=input_ids, attention_mask=attention_mask, past_key_values=outputs.past_key_values)
+        outputs_without_mask = model(input_ids=input_ids, past_key_values=outputs_without_mask.past_key_values)
+        self.assertTrue(torch.allclose(outputs.logits, outputs_without_mask.logits, atol=1e-4))
+
+        gc.collect()
+
     @parameterized.expand(SUPPORTED_ARCHITECTURES)
     def test_merge_from_transformers_and_save(self, model_arch):
         if "text-generation-with-past" not in TasksManager.get_supported_tasks_for_model_type(
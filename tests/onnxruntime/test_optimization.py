@@ -204,6 +204,30 @@ class ORTOptimizerTest(unittest.TestCase):
             # Compare tensors outputs
             self.assertTrue(torch.allclose(model_outputs.logits, optimized_model_outputs.logits, atol=1e-4))
 
+    def test_optimization_fp16_op_block_list(self):
+        model_name = "hf-internal-testing/tiny-random-distilbert"
+        optimization_config = OptimizationConfig(optimization_level=0, fp16=True, fp16_op_block_list=["Gemm"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model = ORTModelForSequenceClassification.from_pretrained(model_name, from_transformers=True)
+            model.save_pretrained(tmp_dir)
+            optimizer = ORTOptimizer.from_pretrained(model)
+            optimizer.optimize(optimization_config=optimization_config, save_dir=tmp_dir)
+            optimized_model = onnx.load(os.path.join(tmp_dir, "model_optimized.onnx"))
+            initializers = {w.name: w for w in optimized_model.graph.initializer}
+            gemm_weights = [
+                initializers[name]
+                for node in optimized_model.graph.node
+                if node.op_type == "Gemm"
+                for name in node.input
+                if name in initializers
+            ]
+            self.assertGreater(len(gemm_weights), 0)
+            for w in gemm_weights:
+                self.assertEqual(w.data_type, onnx.onnx_pb.TensorProto.FLOAT)
+
+            ort_config = ORTConfig.from_pretrained(tmp_dir)
+            self.assertListEqual(ort_config.optimization["fp16_op_block_list"], ["Gemm"])
+
 
 class ORTOptimizerForSeq2SeqLMIntegrationTest(ORTOptimizerTestMixin):
     TASK = "text2text-generation"
@@ -17,6 +17,7 @@ import tempfile
 import unittest
 from functools import partial
 from pathlib import Path
+from unittest import mock
 
 from onnx import load as onnx_load
 from onnxruntime.quantization import QuantFormat, QuantizationMode, QuantType
@@ -67,6 +68,21 @@ class ORTQuantizerTest(unittest.TestCase):
             ORTQuantizer.from_pretrained(model)
         self.assertIn("ORTQuantizer does not support multi-file quantization.", str(context.exception))
 
+    def test_from_pretrained_method_causal_lm_with_past(self):
+        model = ORTModelForCausalLM.from_pretrained(
+            "hf-internal-testing/tiny-random-gpt2", from_transformers=True, use_cache=True, use_merged=False
+        )
+        with self.assertRaises(NotImplementedError) as context:
+            ORTQuantizer.from_pretrained(model)
+        self.assertIn("ORTQuantizer does not support multi-file quantization.", str(context.exception))
+
+        for file_name, path in (
+            (model.decoder_model_name, model.decoder_model_path),
+            (model.decoder_with_past_model_name, model.decoder_with_past_model_path),
+        ):
+            quantizer = ORTQuantizer.from_pretrained(model, file_name=file_name)
+            self.assertEqual(quantizer.onnx_model_path, path)
+
 
 class ORTDynamicQuantizationTest(unittest.TestCase):
     SUPPORTED_ARCHITECTURES_WITH_EXPECTED_QUANTIZED_MATMULS = (
@@ -144,6 +160,47 @@ class ORTDynamicQuantizationTest(unittest.TestCase):
         self.assertTrue(num_quantized_matmul > 0)
         gc.collect()
 
+    @parameterized.expand([(QuantType.QUInt8, "DynamicQuantizeLinear"), (QuantType.QInt8, "QuantizeLinear")])
+    def test_dynamic_quantization_activations_dtype(self, activations_dtype, expected_quantize_op):
+        qconfig = QuantizationConfig(
+            is_static=False,
+            format=QuantFormat.QOperator,
+            mode=QuantizationMode.IntegerOps,
+            activations_dtype=QuantType.QUInt8,
+            weights_dtype=QuantType.QInt8,
+            per_channel=False,
+            reduce_range=False,
+            operators_to_quantize=["MatMul"],
+        )
+        # DynamicQuantizeLinear only produces uint8 activations, int8 ones are quantized with QuantizeLinear
+        qconfig.activations_dtype = activations_dtype
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            quantizer = ORTQuantizer.from_pretrained("assets/onnx")
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+
+            quantized_model = onnx_load(Path(tmp_dir, "model_quantized.onnx"))
+            quantize_ops = {
+                node.op_type
+                for node in quantized_model.graph.node
+                if node.op_type in ["DynamicQuantizeLinear", "QuantizeLinear"]
+            }
+            self.assertEqual(quantize_ops, {expected_quantize_op})
+
+    def test_dynamic_quantization_keeps_config(self):
+        # the model is quantized for a VNNI target, whatever the CPU flags of the current host
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        expected_qconfig_dict = ORTConfig(quantization=qconfig).to_dict()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            quantizer = ORTQuantizer.from_pretrained("assets/onnx")
+            with mock.patch("optimum.onnxruntime.quantization.cpu_needs_reduce_range", return_value=True):
+                with self.assertLogs("optimum.onnxruntime.quantization", level="WARNING") as logs:
+                    quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+            self.assertTrue(any("reduce_range=True" in message for message in logs.output))
+
+            self.assertFalse(qconfig.reduce_range)
+            self.assertEqual(ORTConfig(quantization=qconfig).to_dict(), expected_qconfig_dict)
+            self.assertEqual(ORTConfig.from_pretrained(tmp_dir).to_dict(), expected_qconfig_dict)
+
 
 class ORTStaticQuantizationTest(unittest.TestCase):
     SUPPORTED_ARCHITECTURES_WITH_EXPECTED_QUANTIZED_MATMULS = (
@@ -1,21 +1,61 @@
 import tempfile
 import unittest
+from unittest import mock
 
 import torch
 
 from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig, ORTConfig
-from optimum.onnxruntime.utils import get_device_for_provider, get_provider_for_device
+from optimum.onnxruntime.utils import (
+    cpu_needs_reduce_range,
+    get_device_for_provider,
+    get_provider_for_device,
+    validate_provider_availability,
+)
 
 
 class ProviderAndDeviceGettersTest(unittest.TestCase):
     def test_get_device_for_provider(self):
         self.assertEqual(get_device_for_provider("CPUExecutionProvider"), torch.device("cpu"))
         self.assertEqual(get_device_for_provider("CUDAExecutionProvider"), torch.device("cuda:0"))
+        self.assertEqual(
+            get_device_for_provider("CUDAExecutionProvider", provider_options={"device_id": "1"}),
+            torch.device("cuda:1"),
+        )
+        self.assertEqual(
+            get_device_for_provider("TensorrtExecutionProvider", provider_options={"device_id": 2}),
+            torch.device("cuda:2"),
+        )
 
     def test_get_provider_for_device(self):
         self.assertEqual(get_provider_for_device(torch.device("cpu")), "CPUExecutionProvider")
         self.assertEqual(get_provider_for_device(torch.device("cuda")), "CUDAExecutionProvider")
 
+    def test_validate_provider_availability(self):
+        validate_provider_availability("CPUExecutionProvider")
+        with self.assertRaises(ValueError) as context:
+            validate_provider_availability("CpuExecutionProvider")
+        self.assertIn("did you mean CPUExecutionProvider?", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            validate_provider_availability("TensorRTExecutionProvider")
+        self.assertIn("did you mean TensorrtExecutionProvider?", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            validate_provider_availability("FooExecutionProvider")
+        self.assertIn("the available execution providers are", str(context.exception))
+
+
+class CPUCapabilitiesTest(unittest.TestCase):
+    def test_cpu_needs_reduce_range(self):
+        for flags, expected in [
+            ({"avx", "avx2"}, True),
+            ({"avx2", "avx512f"}, True),
+            ({"avx2", "avx512f", "avx512_vnni"}, False),
+            ({"avx2", "avx_vnni"}, False),
+            ({"neon"}, False),
+            (set(), False),
+        ]:
+            with mock.patch("optimum.onnxruntime.utils.get_cpu_flags", return_value=flags):
+                self.assertEqual(cpu_needs_reduce_range(), expected)
+
 
 class ORTConfigTest(unittest.TestCase):
     def test_save_and_load(self):
@@ -0,0 +1,83 @@
+# coding=utf-8
+# Copyright 2023 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from optimum.utils.file_utils import copy_file
+
+
+class CopyFileTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.src_path = Path(self.tmpdir.name, "model.onnx")
+        # larger than a single `copy_file_range` call may copy
+        self.content = os.urandom(3 * 1024 * 1024 + 7)
+        self.src_path.write_bytes(self.content)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_copy_file(self):
+        dst_path = Path(self.tmpdir.name, "copy.onnx")
+        with mock.patch("shutil.copyfile", wraps=shutil.copyfile) as mocked_copyfile:
+            copy_file(self.src_path, dst_path)
+        self.assertEqual(dst_path.read_bytes(), self.content)
+        self.assertEqual(mocked_copyfile.called, not hasattr(os, "copy_file_range"))
+
+        # an existing destination is overwritten
+        dst_path.write_bytes(b"previous content, longer than nothing")
+        copy_file(str(self.src_path), str(dst_path))
+        self.assertEqual(dst_path.read_bytes(), self.content)
+
+    def test_copy_empty_file(self):
+        self.src_path.write_bytes(b"")
+        dst_path = Path(self.tmpdir.name, "copy.onnx")
+        copy_file(self.src_path, dst_path)
+        self.assertEqual(dst_path.read_bytes(), b"")
+
+    def test_copy_file_onto_itself(self):
+        with self.assertRaises(shutil.SameFileError):
+            copy_file(self.src_path, self.src_path)
+        self.assertEqual(self.src_path.read_bytes(), self.content)
+
+        # the same file reached through another path
+        link_path = Path(self.tmpdir.name, "link.onnx")
+        os.link(self.src_path, link_path)
+        with self.assertRaises(shutil.SameFileError):
+            copy_file(self.src_path, link_path)
+        self.assertEqual(self.src_path.read_bytes(), self.content)
+
+    def test_copy_file_fallback(self):
+        dst_path = Path(self.tmpdir.name, "copy.onnx")
+        # e.g. copies across file systems on older kernels
+        with mock.patch.object(
+            os, "copy_file_range", side_effect=OSError("Invalid cross-device link"), create=True
+        ), mock.patch("shutil.copyfile", wraps=shutil.copyfile) as mocked_copyfile:
+            copy_file(self.src_path, dst_path)
+        mocked_copyfile.assert_called_once_with(self.src_path, dst_path)
+        self.assertEqual(dst_path.read_bytes(), self.content)
+
+        # `copy_file_range` stopping before the end of the file
+        dst_path.unlink()
+        with mock.patch.object(os, "copy_file_range", return_value=0, create=True), mock.patch(
+            "shutil.copyfile", wraps=shutil.copyfile
+        ) as mocked_copyfile:
+            copy_file(self.src_path, dst_path)
+        mocked_copyfile.assert_called_once_with(self.src_path, dst_path)
+        self.assertEqual(dst_path.read_bytes(), self.content)